@@ -96,6 +96,23 @@ def test_cached_nuclide_data_is_returned_as_a_defensive_copy(h5_file):
     assert h5_file.get_nuclide_data()["h1"]["z"] == 1
 
 
+def test_nuclide_table_is_shared_read_only_and_matches_dict_api(h5_file):
+    table = h5_file.get_nuclide_table()
+    indices = h5_file.get_nuclide_indices()
+    nuclides = h5_file.get_nuclide_data()
+
+    assert h5_file.get_nuclide_table() is table
+    assert not table.flags.writeable
+    with pytest.raises(TypeError):
+        indices["h1"] = 5
+    assert list(indices) == list(nuclides)
+    for name, data in nuclides.items():
+        row = table[indices[name]]
+        assert indices[name] == data["index"]
+        for key in ("z", "a", "n", "source", "state", "mass excess", "spin"):
+            assert row[key] == data[key]
+
+
 def test_groups_labels_and_properties(h5_file):
     assert h5_file.get_iterable_groups() == ["step 0", "step 1"]
     assert h5_file.get_zone_labels_for_group("step 0") == [
@@ -121,3 +138,535 @@ def test_batched_mass_fraction_lookup_across_groups(h5_file):
     np.testing.assert_allclose(result["h1"], [0.2, 0.15])
     np.testing.assert_allclose(result["al26g"], [0.1, 0.1])
     np.testing.assert_allclose(result["al26m"], [0.05, 0.1])
+
+
+def test_mass_fraction_lookup_across_groups_in_worker_processes(h5_file):
+    zone = ("1", "shell", "middle")
+    species = ["al26m", "h1"]
+
+    serial = h5_file.get_zone_mass_fractions_in_groups(zone, species)
+    parallel = h5_file.get_zone_mass_fractions_in_groups(
+        zone, species, workers=2
+    )
+
+    assert list(parallel) == species
+    for name in species:
+        np.testing.assert_array_equal(parallel[name], serial[name])
+    with pytest.raises(KeyError):
+        h5_file.get_zone_mass_fractions_in_groups(
+            ("9", "0", "0"), species, workers=2
+        )
+    with pytest.raises(ValueError, match="workers"):
+        h5_file.get_zone_mass_fractions_in_groups(zone, species, workers=0)
+    for zone in [("1", "shell"), ("1", "shell", "middle", "0"), "1"]:
+        with pytest.raises(KeyError):
+            h5_file.get_zone_mass_fractions_in_groups(zone, species, workers=2)
+
+
+def test_mass_fraction_lookup_reads_only_the_selected_species(
+    h5_file, monkeypatch
+):
+    zone = ("1", "shell", "middle")
+    species = list(h5_file.get_nuclide_data())
+    species = [species[-1], species[0], species[-1]]
+    groups = h5_file.get_iterable_groups()
+    zone_index = h5_file.get_zone_labels_for_group(groups[0]).index(zone)
+
+    shapes = []
+    read = wh._read_mass_fractions_block
+
+    def record(file_id, group, rows, columns, out):
+        shapes.append(out.shape)
+        read(file_id, group, rows, columns, out)
+
+    monkeypatch.setattr(wh, "_read_mass_fractions_block", record)
+    result = h5_file.get_zone_mass_fractions_in_groups(zone, species)
+
+    assert shapes == [(1, 2)] * len(groups)
+    for name in species:
+        np.testing.assert_array_equal(
+            result[name],
+            [
+                h5_file.get_group_mass_fractions(group)[
+                    zone_index, h5_file.get_nuclide_indices()[name]
+                ]
+                for group in groups
+            ],
+        )
+
+
+def test_new_h5_group_from_arrays_matches_group_from_zones(h5_file, tmp_path):
+    nuclides = h5_file.get_nuclide_data()
+    species = list(nuclides)
+    labels = h5_file.get_zone_labels_for_group("step 1")
+    mass_fractions = h5_file.get_group_mass_fractions("step 1")[()]
+    properties = h5_file.get_group_properties_in_zones(
+        "step 1", ["time", ("rate scale", "weak")]
+    )
+    zones = {
+        label: {
+            "properties": {key: value[i] for key, value in properties.items()},
+            "mass fractions": {
+                (name, nuclides[name]["z"], nuclides[name]["a"]): x
+                for name, x in zip(species, mass_fractions[i])
+            },
+        }
+        for i, label in enumerate(labels)
+    }
+
+    output_path = tmp_path / "arrays.h5"
+    with wh.New_H5(output_path, nuclides) as new_h5:
+        new_h5.add_group("zones", zones)
+        new_h5.add_group_from_arrays(
+            "arrays",
+            labels,
+            species[::-1],
+            mass_fractions[:, ::-1],
+            properties,
+        )
+        with pytest.raises(ValueError, match="time"):
+            new_h5.add_group_from_arrays(
+                "bad", labels, species, mass_fractions, {"time": [1.0]}
+            )
+
+    with wh.H5(output_path) as result:
+        assert result.get_iterable_groups() == ["arrays", "zones"]
+        for group in ("zones", "arrays"):
+            assert result.get_zone_labels_for_group(group) == labels
+            np.testing.assert_array_equal(
+                result.get_group_mass_fractions(group), mass_fractions
+            )
+            assert (
+                result.get_group_properties_in_zones(group, list(properties))
+                == properties
+            )
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {"compression": "gzip", "compression_opts": 4, "shuffle": True},
+        {"compression": "lzf", "fletcher32": True},
+        {"chunks": (2, 50)},
+    ],
+)
+def test_new_h5_chunked_and_compressed_datasets_read_back(
+    h5_file, tmp_path, options
+):
+    nuclides = h5_file.get_nuclide_data()
+    labels = h5_file.get_zone_labels_for_group("step 1")
+    mass_fractions = h5_file.get_group_mass_fractions("step 1")[()]
+
+    output_path = tmp_path / "chunked.h5"
+    with wh.New_H5(output_path, nuclides, **options) as new_h5:
+        new_h5.add_group_from_arrays(
+            "step 1", labels, list(nuclides), mass_fractions
+        )
+
+    with wh.H5(output_path) as result:
+        dataset = result.get_group_mass_fractions("step 1")
+        assert dataset.chunks is not None
+        assert dataset.compression == options.get("compression")
+        assert dataset.fletcher32 == options.get("fletcher32", False)
+        if "chunks" in options:
+            assert dataset.chunks == (
+                min(2, len(labels)),
+                min(50, len(nuclides)),
+            )
+        np.testing.assert_array_equal(dataset, mass_fractions)
+        assert not isinstance(
+            result.get_group_mass_fractions("step 1", memmap=True), np.memmap
+        )
+        assert result.get_nuclide_data() == nuclides
+        zone = labels[0]
+        species = list(nuclides)[:3]
+        in_groups = result.get_zone_mass_fractions_in_groups(zone, species)
+        for j, name in enumerate(species):
+            assert in_groups[name][0] == mass_fractions[0, j]
+
+
+def test_new_h5_rejects_invalid_dataset_options(h5_file, tmp_path):
+    nuclides = h5_file.get_nuclide_data()
+    with pytest.raises(ValueError, match="gzip"):
+        wh.New_H5(tmp_path / "a.h5", nuclides, compression="zip")
+    with pytest.raises(ValueError, match="gzip"):
+        wh.New_H5(tmp_path / "b.h5", nuclides, compression_opts=4)
+    with pytest.raises(ValueError, match="chunked"):
+        wh.New_H5(tmp_path / "c.h5", nuclides, chunks=False, shuffle=True)
+    assert not (tmp_path / "a.h5").exists()
+
+
+def test_columnar_zone_properties_read_like_zone_datasets(h5_file, tmp_path):
+    nuclides = h5_file.get_nuclide_data()
+    groups = h5_file.get_iterable_groups()
+    output_path = tmp_path / "columnar.h5"
+
+    with wh.New_H5(
+        output_path, nuclides, property_layout="columnar"
+    ) as new_h5:
+        for group in groups:
+            mass_fractions = h5_file.get_group_mass_fractions(group)[()]
+            zones = {
+                label: {
+                    "properties": h5_file.get_group_zone_properties(
+                        group, label
+                    ),
+                    "mass fractions": {
+                        (name, data["z"], data["a"]): mass_fractions[
+                            i, data["index"]
+                        ]
+                        for name, data in nuclides.items()
+                    },
+                }
+                for i, label in enumerate(
+                    h5_file.get_zone_labels_for_group(group)
+                )
+            }
+            del zones[next(iter(zones))]["properties"]["t9"]
+            new_h5.add_group(group, zones)
+
+    properties = ["time", "note", ("rate scale", "weak")]
+    labels = h5_file.get_zone_labels_for_group("step 1")
+
+    with wh.H5(output_path) as result:
+        assert "Names" in result._h5file["step 1/Zone Properties"]
+        for group in groups:
+            assert result.get_group_properties_in_zones(
+                group, properties
+            ) == h5_file.get_group_properties_in_zones(group, properties)
+            floats = result.get_group_properties_in_zones_as_floats(
+                group, ["rho", ("rate scale", "capture", "forward")]
+            )
+            expected = h5_file.get_group_properties_in_zones_as_floats(
+                group, ["rho", ("rate scale", "capture", "forward")]
+            )
+            for key, value in expected.items():
+                np.testing.assert_array_equal(floats[key], value)
+            with pytest.raises(KeyError):
+                result.get_group_properties_in_zones(group, ["t9"])
+
+        expected = h5_file.get_group_zone_properties("step 1", labels[1])
+        assert result.get_group_zone_properties("step 1", labels[1]) == (
+            expected
+        )
+        assert "t9" not in result.get_group_zone_properties(
+            "step 1", labels[0]
+        )
+        assert result.get_zone_properties_in_groups(
+            labels[1], properties
+        ) == h5_file.get_zone_properties_in_groups(labels[1], properties)
+
+
+def test_columnar_zone_properties_keep_the_stored_strings(h5_file, tmp_path):
+    nuclides = h5_file.get_nuclide_data()
+    species = list(nuclides)[:1]
+    labels = ["a", "b", "c"]
+    properties = {
+        "count": [10, 20, 30],
+        "exponent": ["1.5e+03", "2.5", "3.5"],
+        "padded": ["007", "8", "9"],
+        "time": [3.0, 0.25, np.float32(0.1)],
+        "mixed": [1, 2.0, "x"],
+    }
+
+    results = {}
+    for layout in ("zones", "columnar"):
+        output_path = tmp_path / (layout + ".h5")
+        with wh.New_H5(
+            output_path, nuclides, property_layout=layout
+        ) as new_h5:
+            new_h5.add_group_from_arrays(
+                "step 1", labels, species, np.ones((3, 1)), properties
+            )
+            new_h5.add_group(
+                "step 2",
+                {
+                    label: {
+                        "properties": {
+                            prop: value[i]
+                            for prop, value in properties.items()
+                        },
+                        "mass fractions": {},
+                    }
+                    for i, label in enumerate(labels)
+                },
+            )
+        with wh.H5(output_path) as result:
+            results[layout] = [
+                result.get_group_properties_in_zones(group, list(properties))
+                for group in ("step 1", "step 2")
+            ]
+
+    assert results["columnar"] == results["zones"]
+    assert results["columnar"][1]["count"] == ["10", "20", "30"]
+    assert results["columnar"][1]["exponent"][0] == "1.5e+03"
+    assert results["columnar"][1]["padded"][0] == "007"
+    assert results["columnar"][1]["time"] == ["3.0", "0.25", "0.1"]
+
+
+def test_decoded_zone_properties_are_cached_per_group(h5_file, tmp_path):
+    label = h5_file.get_zone_labels_for_group("step 1")[0]
+
+    properties = h5_file.get_group_zone_properties("step 1", label)
+    properties["time"] = "changed"
+    assert h5_file.get_group_zone_properties("step 1", label)["time"] != (
+        "changed"
+    )
+
+    # Two group property tables and two zone property histories.
+    series = h5_file.get_zone_properties_in_groups(label, ["time", "note"])
+    info = h5_file.get_cache_info()
+    assert (info["entries"], info["misses"]) == (4, 4)
+    series["time"].append("changed")
+    assert h5_file.get_zone_properties_in_groups(label, ["time", "t9"])[
+        "time"
+    ] == (series["time"][:-1])
+    assert h5_file.get_cache_info()["hits"] == info["hits"] + 3
+    assert h5_file.get_cache_info()["misses"] == 5
+
+    h5_file.get_group_properties_in_zones("step 1", ["time"])
+    hits = h5_file.get_cache_info()["hits"]
+    h5_file.get_group_properties_in_zones("step 1", ["time"])
+    assert h5_file.get_cache_info()["hits"] == hits + 1
+
+    with wh.H5(H5_FILE, cache_bytes=info["bytes"] - 1) as small:
+        assert small.get_zone_properties_in_groups(label, ["time"]) == {
+            "time": series["time"][:-1]
+        }
+        small_info = small.get_cache_info()
+        assert small_info["bytes"] <= small_info["max bytes"] < info["bytes"]
+
+    with wh.H5(H5_FILE, cache_bytes=0) as uncached:
+        for _ in range(2):
+            uncached.get_zone_properties_in_groups(label, ["time"])
+        assert uncached.get_cache_info()["entries"] == 0
+        assert uncached.get_cache_info()["hits"] == 0
+
+    for _ in range(2):
+        h5_file.plot_zone_mass_fractions_vs_property(
+            label, "time", ["h1", "al26g"], savefig=str(tmp_path / "a.png")
+        )
+    assert ("zone mass fractions", label, ("h1", "al26g")) in (
+        h5_file._group_cache
+    )
+    assert h5_file.get_cache_info()["hits"] == hits + 4
+
+    h5_file.clear_cache()
+    assert h5_file.get_cache_info() == {
+        "hits": 0,
+        "misses": 0,
+        "entries": 0,
+        "bytes": 0,
+        "max bytes": info["max bytes"],
+    }
+    h5_file.get_zone_properties_in_groups(label, ["time"])
+    assert h5_file.get_cache_info()["misses"] == 3
+    with pytest.raises(ValueError, match="cache_bytes"):
+        wh.H5(H5_FILE, cache_bytes=-1)
+
+
+def test_group_index_serves_times_and_zone_series(
+    h5_file, tmp_path, monkeypatch
+):
+    nuclides = h5_file.get_nuclide_data()
+    groups = h5_file.get_iterable_groups()
+    output_path = tmp_path / "indexed.h5"
+
+    with wh.New_H5(
+        output_path, nuclides, index_properties=["t9", "rho"]
+    ) as new_h5:
+        for group in groups:
+            labels = h5_file.get_zone_labels_for_group(group)
+            properties = h5_file.get_group_properties_in_zones(
+                group, ["time", "t9", "rho", "note"]
+            )
+            new_h5.add_group_from_arrays(
+                group,
+                labels,
+                list(nuclides),
+                h5_file.get_group_mass_fractions(group),
+                properties,
+            )
+        with pytest.raises(ValueError):
+            new_h5.add_group("Group Index", {})
+
+    times = h5_file.get_group_times()
+    label = h5_file.get_zone_labels_for_group("step 1")[1]
+    expected = h5_file.get_zone_properties_in_groups_as_floats(
+        label, ["t9", "rho"]
+    )
+    assert h5_file.get_group_for_time(times[-1] + 1) == groups[-1]
+
+    with wh.H5(output_path) as result:
+        assert result.get_iterable_groups() == groups
+        np.testing.assert_array_equal(result.get_group_times(), times)
+        assert result.get_group_for_time(times[0]) == groups[0]
+
+        monkeypatch.setattr(
+            result, "get_zone_properties_in_groups", pytest.fail
+        )
+        series = result.get_zone_properties_in_groups_as_floats(
+            label, ["t9", "rho"]
+        )
+        for key, value in expected.items():
+            np.testing.assert_array_equal(series[key], value)
+        series["t9"] *= 100
+        np.testing.assert_array_equal(
+            result.get_zone_properties_in_groups_as_floats(label, ["t9"])[
+                "t9"
+            ],
+            expected["t9"],
+        )
+
+    # Without an index the series are built on first use and kept.
+    monkeypatch.setattr(h5_file, "_get_group_zone_property_hash", pytest.fail)
+    assert h5_file.get_zone_properties_in_groups_as_floats(
+        label, ["rho"]
+    ).keys() == {"rho"}
+    series = h5_file.get_zone_properties_in_groups(label, ["t9", "rho"])
+    series["t9"].append("changed")
+    assert h5_file.get_zone_properties_in_groups(label, ["t9"])["t9"] == (
+        series["t9"][:-1]
+    )
+
+
+def test_group_index_is_written_with_chunked_and_compressed_groups(
+    h5_file, tmp_path
+):
+    nuclides = h5_file.get_nuclide_data()
+    output_path = tmp_path / "indexed.h5"
+
+    for options in ({"compression": "gzip"}, {"chunks": (4, 4)}):
+        with wh.New_H5(
+            output_path, nuclides, index_properties=["t9"], **options
+        ) as new_h5:
+            new_h5.add_group_from_arrays(
+                "step 1", ["a"], [], np.empty((1, 0)), {"t9": [0.5]}
+            )
+        with wh.H5(output_path) as result:
+            np.testing.assert_array_equal(
+                result.get_zone_properties_in_groups_as_floats(
+                    ("a", "0", "0"), ["t9"]
+                )["t9"],
+                [0.5],
+            )
+
+    new_h5 = wh.New_H5(output_path, nuclides, index_properties=["t9"])
+    new_h5.add_group_from_arrays(
+        "step 1", ["a"], [], np.empty((1, 0)), {"t9": [0.5]}
+    )
+    new_h5.file.create_group("Group Index")
+    with pytest.raises(ValueError):
+        new_h5.close()
+    assert not new_h5.file
+
+
+def test_group_index_matches_the_stored_property_strings(h5_file, tmp_path):
+    nuclides = h5_file.get_nuclide_data()
+    output_path = tmp_path / "indexed.h5"
+    t9 = np.array([0.1, 0.7], dtype=np.float32)
+
+    with wh.New_H5(output_path, nuclides, index_properties=["t9"]) as new_h5:
+        new_h5.add_group_from_arrays(
+            "step 1", ["a", "b"], [], np.empty((2, 0)), {"t9": t9}
+        )
+        new_h5.add_group(
+            "step 2",
+            {
+                "a": {"properties": {"t9": t9[0]}, "mass fractions": {}},
+                "b": {"properties": {"t9": t9[1]}, "mass fractions": {}},
+            },
+        )
+
+    with wh.H5(output_path) as result:
+        for label in ("a", "b"):
+            expected = [
+                float(value)
+                for value in result.get_zone_properties_in_groups(
+                    (label, "0", "0"), ["t9"]
+                )["t9"]
+            ]
+            np.testing.assert_array_equal(
+                result._get_group_index()["columns"]["t9"][
+                    :, result._get_group_index()["labels"][(label, "0", "0")]
+                ],
+                expected,
+            )
+
+
+def test_mass_fractions_cube_matches_stacked_groups(h5_file):
+    cube = h5_file.get_mass_fractions_cube()
+    groups = h5_file.get_iterable_groups()
+    expected = np.stack(
+        [h5_file.get_group_mass_fractions(group)[()] for group in groups]
+    )
+
+    assert cube.shape == expected.shape
+    assert len(cube) == len(groups)
+    assert cube.get_groups() == groups
+    for key in (
+        np.s_[:],
+        np.s_[1],
+        np.s_[-1, 2],
+        np.s_[:, 1, [4, 0, 2]],
+        np.s_[::-1, 1:, -3:],
+        np.s_[..., 3],
+        np.s_[[True, False], :, 5],
+        np.s_[:, [], 1],
+        np.s_[0, 0, 0],
+        np.s_[0, :, [3, 1, 3]],
+        np.s_[[1, 0, 1], :, 2],
+        np.s_[-1, [2, 0], 1:],
+        np.s_[:, ::-1, np.array([5, 0])],
+    ):
+        assert cube[key].shape == expected[key].shape
+        np.testing.assert_array_equal(cube[key], expected[key])
+    np.testing.assert_array_equal(np.asarray(cube), expected)
+
+    for key in (
+        np.s_[0, 0, 0, 0],
+        np.s_[len(groups)],
+        np.s_[:, [0, 1], [1, 3]],
+        np.s_[[0, 1], [0, 1]],
+        np.s_[[0, 1], :, [2, 3]],
+        np.s_[:, [[0, 1]]],
+    ):
+        with pytest.raises(IndexError):
+            cube[key]
+
+
+def test_mass_fractions_cube_reads_only_the_selection(
+    h5_file, tmp_path, monkeypatch
+):
+    cube = h5_file.get_mass_fractions_cube()
+
+    shapes = []
+    read = wh._read_mass_fractions_block
+
+    def record(file_id, group, rows, columns, out):
+        shapes.append(out.shape)
+        read(file_id, group, rows, columns, out)
+
+    monkeypatch.setattr(wh, "_read_mass_fractions_block", record)
+    cube[:, [0, cube.shape[1] - 1], cube.shape[2] - 1]
+    assert shapes == [(2, 1)] * len(cube)
+
+    nuclides = h5_file.get_nuclide_data()
+    with wh.New_H5(tmp_path / "ragged.h5", nuclides) as new_h5:
+        for group, labels in (("step 1", ["a", "b"]), ("step 2", ["a"])):
+            new_h5.add_group_from_arrays(
+                group, labels, [], np.empty((len(labels), 0))
+            )
+    with wh.H5(tmp_path / "ragged.h5") as ragged:
+        with pytest.raises(ValueError, match="step 2"):
+            ragged.get_mass_fractions_cube()
+
+
+def test_contiguous_mass_fractions_are_memory_mapped(h5_file):
+    for group in h5_file.get_iterable_groups():
+        mapped = h5_file.get_group_mass_fractions(group, memmap=True)
+        assert isinstance(mapped, np.memmap)
+        assert not mapped.flags.writeable
+        np.testing.assert_array_equal(
+            mapped, h5_file.get_group_mass_fractions(group)[()]
+        )
@@ -23,11 +23,18 @@ def test_top_level_public_api():
     assert wnutils.__all__ == [
         "Base",
         "H5",
+        "Mass_Fractions_Cube",
         "Multi_H5",
         "Multi_Xml",
+        "Network",
         "New_H5",
         "New_Xml",
+        "Partition_Functions",
+        "Rate_Engine",
         "Reaction",
+        "Reaction_Index",
+        "Streaming_New_Xml",
+        "Streaming_Xml",
         "Xml",
         "validate",
         "__author__",
@@ -0,0 +1,213 @@
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import wnutils.network as wn
+import wnutils.xml as wx
+
+XML_FILE = Path(__file__).parent / "data" / "small_network.xml"
+USER_FUNCS = {"fixture user rate": lambda reaction, t9: t9 + 1}
+
+
+def _non_smoker_reaction(fits, reactants=("h1", "fe56"), products=("co57",)):
+    reaction = wx.Reaction()
+    reaction.reactants = list(reactants)
+    reaction.nuclide_reactants = list(reactants)
+    reaction.products = list(products) + ["gamma"]
+    reaction.nuclide_products = list(products)
+    reaction.data = {"type": "non_smoker_fit", "fits": fits}
+    return reaction
+
+
+def _fit(a1, a7, t9_low, t9_high):
+    fit = {f"a{i}": 0.1 * i for i in range(2, 7)}
+    fit.update({"a1": a1, "a7": a7, "Tlowfit": t9_low, "Thighfit": t9_high})
+    return fit
+
+
+def test_rate_engine_matches_reaction_rates():
+    reactions = wx.Xml(XML_FILE).get_reaction_data()
+    reactions["h1 + fe56 -> co57 + gamma"] = _non_smoker_reaction(
+        [_fit(1.0, 0.5, 0.1, 2.0), _fit(-2.0, 1.5, 0.5, 10.0)]
+    )
+    engine = wn.Rate_Engine(reactions)
+    t9 = np.array([0.01, 0.3, 1.0, 2.5, 20.0])
+
+    rates = engine.compute_rates(t9, USER_FUNCS)
+
+    assert engine.get_reactions() == list(reactions)
+    assert rates.shape == (len(reactions), len(t9))
+    for i, reaction in enumerate(reactions.values()):
+        for j, t in enumerate(t9):
+            np.testing.assert_allclose(
+                rates[i, j], reaction.compute_rate(t, USER_FUNCS), rtol=1e-12
+            )
+
+    np.testing.assert_allclose(
+        engine.compute_rates(1.0, USER_FUNCS), rates[:, 2], rtol=1e-12
+    )
+
+
+def test_rate_engine_requires_user_functions():
+    engine = wn.Rate_Engine(wx.Xml(XML_FILE).get_reaction_data())
+
+    with pytest.raises(KeyError, match="fixture user rate"):
+        engine.compute_rates([1.0])
+
+
+def test_reaction_index_selects_reactions_in_memory():
+    reactions = wx.Xml(XML_FILE).get_reaction_data()
+    index = wn.Reaction_Index(reactions)
+
+    assert list(index.get_reactions(reactants="h1")) == [
+        "h1 + al26g -> si27 + gamma",
+        "h1 + al26m -> si27 + gamma",
+    ]
+    assert list(index.get_reactions(reactants=["h1", "al26m"])) == [
+        "h1 + al26m -> si27 + gamma"
+    ]
+    assert list(index.get_reactions(nuclide="al26m")) == [
+        "al26m -> al26g + gamma",
+        "h1 + al26m -> si27 + gamma",
+    ]
+    assert list(
+        index.get_reactions(products="si27", rate_type="non_smoker_fit")
+    ) == ["h1 + al26g -> si27 + gamma"]
+    assert list(index.get_reactions(source="wnutils table-rate fixture")) == [
+        "n + fe56 -> fe57 + gamma"
+    ]
+    assert index.get_reactions(reactants="fe57") == {}
+    assert index.get_reactions() == reactions
+
+
+def test_network_flows_match_reaction_by_reaction_flows():
+    xml = wx.Xml(XML_FILE)
+    reactions = xml.get_reaction_data()
+    reactions["h1 + h1 -> h2 + gamma"] = _non_smoker_reaction(
+        [_fit(-5.0, 0.0, 0.1, 10.0)], ("h1", "h1"), ("h2",)
+    )
+    network = wn.Network(xml.get_nuclide_data(), reactions)
+    species = network.get_species()
+
+    rng = np.random.default_rng(0)
+    abundances = rng.uniform(0, 0.1, (3, len(species)))
+    t9 = np.array([0.5, 1.0, 2.0])
+    rho = np.array([1.0, 10.0, 1.0e4])
+    ratios = rng.uniform(0, 2, (3, len(reactions)))
+
+    flows = network.compute_flows(abundances, t9, rho, USER_FUNCS, ratios)
+
+    for i in range(3):
+        y = dict(zip(species, abundances[i]))
+        for j, reaction in enumerate(reactions.values()):
+            rate = reaction.compute_rate(t9[i], USER_FUNCS)
+            n_r = len(reaction.nuclide_reactants)
+            forward = rate * rho[i] ** (n_r - 1)
+            for name in reaction.nuclide_reactants:
+                forward *= y[name]
+            if n_r == 2 and len(set(reaction.nuclide_reactants)) == 1:
+                forward /= 2
+            n_p = len(reaction.nuclide_products)
+            reverse = rate * ratios[i, j] * rho[i] ** (n_p - 1)
+            for name in reaction.nuclide_products:
+                reverse *= y[name]
+            np.testing.assert_allclose(flows["forward"][i, j], forward)
+            np.testing.assert_allclose(flows["reverse"][i, j], reverse)
+
+    np.testing.assert_array_equal(
+        flows["net"], flows["forward"] - flows["reverse"]
+    )
+    assert (
+        network.get_reactant_matrix()[
+            network.get_reactions().index("h1 + h1 -> h2 + gamma"),
+            species.index("h1"),
+        ]
+        == 2
+    )
+    assert not np.any(
+        network.compute_flows(abundances, t9, rho, USER_FUNCS)["reverse"]
+    )
+
+
+def test_network_requires_reaction_species():
+    xml = wx.Xml(XML_FILE)
+    nuclides = xml.get_nuclide_data()
+    del nuclides["si27"]
+
+    with pytest.raises(KeyError, match="si27"):
+        wn.Network(nuclides, xml.get_reaction_data())
+
+
+def test_partition_functions_match_per_nuclide_tables():
+    nuclides = wx.Xml(XML_FILE).get_nuclide_data()
+    partition_functions = wn.Partition_Functions(nuclides)
+    t9 = np.array([0.1, 1.0, 1.5, 2.5, 3.0, 50.0])
+
+    result = partition_functions.compute_partition_functions(t9)
+
+    assert partition_functions.get_species() == list(nuclides)
+    assert result.shape == (len(nuclides), len(t9))
+    for i, nuclide in enumerate(nuclides.values()):
+        if len(nuclide["t9"]) == 0:
+            expected = np.full(len(t9), 2 * nuclide["spin"] + 1)
+        else:
+            expected = np.power(
+                10.0, np.interp(t9, nuclide["t9"], np.log10(nuclide["partf"]))
+            )
+        np.testing.assert_allclose(result[i], expected, rtol=1e-12)
+
+    np.testing.assert_allclose(
+        partition_functions.compute_partition_functions(1.5), result[:, 2]
+    )
+
+
+def test_network_q_values_and_reverse_ratios():
+    xml = wx.Xml(XML_FILE)
+    nuclides = xml.get_nuclide_data()
+    reactions = xml.get_reaction_data()
+    reactions["h1 + h1 -> h2 + positron + neutrino_e"] = _non_smoker_reaction(
+        [_fit(-5.0, 0.0, 0.1, 10.0)], ("h1", "h1"), ("h2",)
+    )
+    reactions["h1 + h1 -> h2 + positron + neutrino_e"].products += [
+        "positron",
+        "neutrino_e",
+    ]
+    network = wn.Network(nuclides, reactions)
+    t9 = np.array([0.5, 2.0])
+
+    q_values = dict(zip(network.get_reactions(), network.compute_q_values()))
+    ratios = network.compute_reverse_ratios(t9)
+
+    delta = {
+        name: nuclide["mass excess"] for name, nuclide in nuclides.items()
+    }
+    reaction = "h1 + al26g -> si27 + gamma"
+    q_value = delta["h1"] + delta["al26g"] - delta["si27"]
+    assert q_values[reaction] == pytest.approx(q_value)
+    assert q_values["h1 + h1 -> h2 + positron + neutrino_e"] == pytest.approx(
+        2 * delta["h1"] - delta["h2"] - 2 * 0.51099895
+    )
+
+    def partf(name, t):
+        nuclide = nuclides[name]
+        if len(nuclide["t9"]) == 0:
+            return 2 * nuclide["spin"] + 1
+        return 10 ** np.interp(t, nuclide["t9"], np.log10(nuclide["partf"]))
+
+    j = network.get_reactions().index(reaction)
+    for i, t in enumerate(t9):
+        expected = (
+            partf("h1", t)
+            * partf("al26g", t)
+            / partf("si27", t)
+            * (1 * 26 / 27) ** 1.5
+            * 9.868459948741e9
+            * t**1.5
+            * np.exp(-q_value / (0.08617333262 * t))
+        )
+        assert ratios[i, j] == pytest.approx(expected, rel=1e-10)
+
+    k = network.get_reactions().index("h1 + h1 -> h2 + positron + neutrino_e")
+    assert not np.any(ratios[:, k])
+    np.testing.assert_allclose(network.compute_reverse_ratios(2.0), ratios[1])
@@ -47,6 +47,16 @@ def test_h5_and_multi_h5_plots_can_be_saved(tmp_path):
     assert multi_plot.is_file()
 
 
+def test_repeated_h5_group_plots_reuse_cached_mass_fractions():
+    with wh.H5(H5_FILE) as h5_file:
+        for _ in range(3):
+            h5_file.plot_group_mass_fractions("step 1", ["h1", "he4"])
+            plt.close("all")
+        info = h5_file.get_cache_info()
+
+    assert (info["misses"], info["hits"]) == (1, 2)
+
+
 def test_movie_rejects_curve_with_wrong_number_of_frames():
     extra_curves = [(np.arange(2), np.zeros((2, 2)))]
 
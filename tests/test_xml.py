@@ -1,5 +1,7 @@
 from pathlib import Path
+import shutil
 
+from lxml import etree
 import numpy as np
 import pytest
 
@@ -66,6 +68,24 @@ def test_rate_table_accepts_real_number_scalars():
     assert reaction.compute_rate(np.int64(1)) == expected
 
 
+def test_rate_table_evaluates_arrays_with_cached_splines():
+    reaction = wx.Xml(XML_FILE).get_reaction_data()["n + fe56 -> fe57 + gamma"]
+    t9 = np.concatenate(
+        ([reaction.data["t9"][0] / 2], reaction.data["t9"], [100.0])
+    )
+
+    rates = reaction.compute_rate(t9)
+    splines = reaction._get_rate_table_splines()
+
+    np.testing.assert_allclose(rates, [reaction.compute_rate(t) for t in t9])
+    assert rates[0] == reaction.data["rate"][0] * reaction.data["sef"][0]
+    assert rates[-1] == reaction.data["rate"][-1] * reaction.data["sef"][-1]
+    assert reaction._get_rate_table_splines() == splines
+
+    reaction.data["rate"] = 2 * reaction.data["rate"]
+    np.testing.assert_allclose(reaction.compute_rate(t9), 2 * rates)
+
+
 def test_reaction_rate_errors_raise_exceptions():
     user_reaction = wx.Xml(XML_FILE).get_reaction_data()[
         "h1 + al26m -> si27 + gamma"
@@ -154,6 +174,19 @@ def test_new_xml_round_trip_preserves_both_al26_states(tmp_path):
     assert result.get_zone_data().keys() == source.get_zone_data().keys()
 
 
+def test_new_xml_merges_states_set_in_separate_calls(tmp_path):
+    nuclides = wx.Xml(XML_FILE).get_nuclide_data()
+    output = tmp_path / "states.xml"
+    new_xml = wx.New_Xml("nuclear_data")
+    new_xml.set_nuclide_data({"al26m": nuclides["al26m"]})
+    new_xml.set_nuclide_data({"al26g": nuclides["al26g"]})
+    new_xml.write(output)
+
+    result = wx.Xml(output)
+    assert len(result._xpath("//nuclide")) == 1
+    assert set(result.get_nuclide_data()) == {"al26g", "al26m"}
+
+
 def test_new_xml_rejects_over_tagged_properties():
     zones = {
         "0": {
@@ -172,3 +205,265 @@ def test_new_xml_rejects_over_tagged_properties():
     }
     with pytest.raises(ValueError, match="between one and three"):
         wx.New_Xml("reaction_data").set_reaction_data({"fixture": reaction})
+
+
+def test_streaming_zones_match_parsed_zone_data():
+    zones = list(wx.Streaming_Xml(XML_FILE).iter_zones())
+
+    assert zones == list(wx.Xml(XML_FILE).get_zone_data().items())
+    assert [label for label, _ in zones] == [
+        "0",
+        ("1", "shell"),
+        ("2", "shell", "outer"),
+    ]
+
+
+def test_mass_fractions_matrix_matches_zone_data():
+    xml = wx.Xml(XML_FILE)
+    matrix = xml.get_mass_fractions_matrix()
+    zones = xml.get_zone_data()
+
+    assert matrix["labels"] == list(zones)
+    assert matrix["mass fractions"].shape == (3, len(matrix["species"]))
+    for i, zone in enumerate(zones.values()):
+        for j, species in enumerate(matrix["species"]):
+            assert matrix["mass fractions"][i, j] == zone[
+                "mass fractions"
+            ].get(species, 0)
+
+    selected = xml.get_mass_fractions_matrix("[@label1 = '1']")
+    assert selected["labels"] == [("1", "shell")]
+    np.testing.assert_array_equal(
+        selected["mass fractions"], matrix["mass fractions"][1:2]
+    )
+
+
+def test_sparse_abundances_match_dense_abundances():
+    xml = wx.Xml(XML_FILE)
+    dense = xml.get_all_abundances_in_zones()
+    sparse = xml.get_all_abundances_in_zones(sparse=True)
+
+    assert sparse.shape == (3, 27 * 32)
+    np.testing.assert_allclose(sparse.toarray().reshape(dense.shape), dense)
+    assert sparse[0, 13 * 32 + 13] == pytest.approx((0.15 + 0.1) / 26)
+
+
+def test_abundances_vs_mass_number_in_batches():
+    xml = wx.Xml(XML_FILE)
+    cube = xml.get_all_abundances_in_zones()
+
+    expected = np.zeros((3, 27 + 32 + 2))
+    for z in range(cube.shape[1]):
+        for n in range(cube.shape[2]):
+            expected[:, z + n] += cube[:, z, n]
+
+    for batch_size in (None, 1, 2):
+        np.testing.assert_allclose(
+            xml.get_abundances_vs_nucleon_number("a", batch_size=batch_size),
+            expected,
+        )
+
+    with pytest.raises(ValueError, match="batch_size"):
+        xml.get_abundances_vs_nucleon_number("a", batch_size=0)
+
+
+def test_xpath_selections_are_cached_per_selector():
+    xml = wx.Xml(XML_FILE)
+    zones = xml._get_zones("[@label1 = '1']")
+
+    assert xml._get_zones("[@label1 = '1']") is zones
+    assert len(zones) == 1
+
+    for i in range(wx._XPATH_RESULT_CACHE_SIZE + 1):
+        xml._get_zones(f"[position() > {i}]")
+
+    assert len(xml._xpath_results) == wx._XPATH_RESULT_CACHE_SIZE
+    assert xml._get_zones("[@label1 = '1']") is not zones
+
+
+def test_sidecar_cache_is_loaded_and_rebuilt_when_stale(tmp_path):
+    file = tmp_path / XML_FILE.name
+    shutil.copy(XML_FILE, file)
+    expected = wx.Xml(XML_FILE)
+
+    wx.Xml(file, cache=True)
+    assert (tmp_path / (file.name + ".wnutils.npz")).exists()
+
+    cached = wx.Xml(file, cache=True)
+    assert cached._root_element is None
+    assert cached.get_type() == "libnucnet_input"
+    assert cached.get_zone_data() == expected.get_zone_data()
+    assert cached.get_properties(["time"]) == expected.get_properties(["time"])
+    assert set(cached.get_nuclide_data()) == set(expected.get_nuclide_data())
+    assert cached._root_element is None
+
+    assert cached.get_zone_data("[@label1 = '1']") == expected.get_zone_data(
+        "[@label1 = '1']"
+    )
+
+    file.write_text(file.read_text().replace('label1="1"', 'label1="9"'))
+    rebuilt = wx.Xml(file, cache=True)
+    assert rebuilt._root_element is not None
+    assert ("9", "shell") in rebuilt.get_zone_data()
+
+
+def test_sidecar_cache_validation_and_fallbacks(tmp_path, monkeypatch):
+    file = tmp_path / XML_FILE.name
+    text = XML_FILE.read_text().replace(
+        '<property name="time">',
+        '<property name="empty"/>\n<property name="time">',
+        1,
+    )
+    file.write_text(text)
+    expected = wx.Xml(file)
+    assert None in expected.get_properties(["empty"], "[1]")["empty"]
+
+    wx.Xml(file, cache=True)
+    monkeypatch.setattr(wx.Xml, "_get_file_hash", pytest.fail)
+    cached = wx.Xml(file, cache=True)
+    assert cached._root_element is None
+    assert cached.get_properties(["empty"], "[1]") == (
+        expected.get_properties(["empty"], "[1]")
+    )
+    assert cached.get_zone_data() == expected.get_zone_data()
+
+    with open(XML_FILE, "rb") as stream:
+        unbacked = wx.Xml(stream, cache=True)
+    assert unbacked.get_type() == expected.get_type()
+
+    included = tmp_path / "included.xml"
+    included.write_text(
+        '<?xml version="1.0"?>\n'
+        '<libnucnet_input xmlns:xi="http://www.w3.org/2001/XInclude">'
+        f'<xi:include href="{file.name}" xpointer="xpointer(//zone_data)"/>'
+        "</libnucnet_input>"
+    )
+    wx.Xml(included, cache=True)
+    assert not (tmp_path / (included.name + ".wnutils.npz")).exists()
+
+
+def test_parallel_zone_extraction_matches_serial():
+    serial = wx.Xml(XML_FILE)
+    parallel = wx.Xml(XML_FILE, workers=2)
+
+    assert parallel._root_element is None
+    assert parallel.get_properties(["time"]) == serial.get_properties(["time"])
+    assert parallel._root_element is None
+    assert parallel.get_zone_data() == serial.get_zone_data()
+    assert parallel.get_zone_data("[@label1 = '2']") == serial.get_zone_data(
+        "[@label1 = '2']"
+    )
+    assert len(wx._split_zone_data(XML_FILE, 2)) == 2
+
+    with pytest.raises(ValueError, match="workers"):
+        wx.Xml(XML_FILE, workers=0)
+
+
+def test_parallel_zone_extraction_falls_back_for_unsplittable_markup(
+    tmp_path,
+):
+    text = XML_FILE.read_text()
+    zone_data = text.index("<zone_data>") + len("<zone_data>")
+    for markup in ("<!-- <zone/> -->", "<![CDATA[<zone>]]>", "<?pi <zone?>"):
+        file = tmp_path / "markup.xml"
+        file.write_text(text[:zone_data] + markup + text[zone_data:])
+
+        assert wx._split_zone_data(file, 2) is None
+        assert wx.Xml(file, workers=2).get_zone_data() == (
+            wx.Xml(XML_FILE).get_zone_data()
+        )
+
+
+def test_streaming_new_xml_matches_new_xml(tmp_path):
+    source = wx.Xml(XML_FILE)
+    nuclides = source.get_nuclide_data()
+    reactions = source.get_reaction_data()
+    zones = source.get_zone_data()
+
+    new_xml = wx.New_Xml("libnucnet_input")
+    new_xml.set_nuclide_data(nuclides)
+    new_xml.set_reaction_data(reactions)
+    new_xml.set_zone_data(zones)
+    new_xml.write(tmp_path / "new.xml")
+
+    with wx.Streaming_New_Xml(
+        tmp_path / "streamed.xml", "libnucnet_input"
+    ) as streaming_xml:
+        streaming_xml.set_nuclide_data(nuclides)
+        streaming_xml.set_reaction_data(reactions)
+        streaming_xml.set_zone_data(iter(zones.items()))
+
+    assert (tmp_path / "streamed.xml").read_text().rstrip() == (
+        tmp_path / "new.xml"
+    ).read_text().rstrip()
+
+
+def test_new_xml_zone_data_from_arrays_matches_zone_dicts(tmp_path):
+    zones = wx.Xml(XML_FILE).get_zone_data()
+    matrix = wx.Xml(XML_FILE).get_mass_fractions_matrix()
+    properties = {
+        key: [zone["properties"][key] for zone in zones.values()]
+        for key in ("time", "t9", "rho")
+    }
+    names = [key[0] for key in matrix["species"]]
+
+    new_xml = wx.New_Xml("zone_data")
+    new_xml.set_zone_data_from_arrays(
+        matrix["labels"], names, matrix["mass fractions"], properties
+    )
+    new_xml.write(tmp_path / "arrays.xml")
+
+    with wx.Streaming_New_Xml(tmp_path / "streamed.xml", "zone_data") as out:
+        out.set_zone_data_from_arrays(
+            matrix["labels"],
+            matrix["species"],
+            matrix["mass fractions"],
+            properties,
+        )
+
+    for output in ("arrays.xml", "streamed.xml"):
+        result = wx.Xml(tmp_path / output).get_zone_data()
+        assert list(result) == list(zones)
+        for label, zone in zones.items():
+            assert result[label]["mass fractions"] == zone["mass fractions"]
+            for key, values in properties.items():
+                assert (
+                    result[label]["properties"][key] == zone["properties"][key]
+                )
+
+    with pytest.raises(ValueError, match="one column for each species"):
+        new_xml.set_zone_data_from_arrays(
+            matrix["labels"], names[1:], matrix["mass fractions"]
+        )
+
+
+def test_streaming_new_xml_writes_sections_in_order(tmp_path):
+    zones = wx.Xml(XML_FILE).get_zone_data()
+
+    with wx.Streaming_New_Xml(
+        tmp_path / "zones.xml", "libnucnet_input", pretty_print=False
+    ) as streaming_xml:
+        streaming_xml.set_zone_data(zones)
+        with pytest.raises(ValueError, match="order"):
+            streaming_xml.set_nuclide_data({})
+
+    result = wx.Xml(tmp_path / "zones.xml")
+    assert result.get_zone_data() == zones
+    assert result.get_nuclide_data() == {}
+
+    new_xml = wx.New_Xml("libnucnet_input")
+    new_xml.set_zone_data(zones)
+    new_xml.write(str(tmp_path / "expected.xml"), pretty_print=False)
+    assert [
+        element.tag
+        for element in etree.parse(str(tmp_path / "zones.xml")).iter()
+        if isinstance(element.tag, str)
+    ] == [
+        element.tag
+        for element in etree.parse(str(tmp_path / "expected.xml")).iter()
+        if isinstance(element.tag, str)
+    ]
+
+    with pytest.raises(ValueError, match="zone_data"):
+        with wx.Streaming_New_Xml(tmp_path / "network.xml") as streaming_xml:
+            streaming_xml.set_zone_data(zones)
@@ -0,0 +1,56 @@
+"""Time New_Xml.set_nuclide_data for growing numbers of nuclides."""
+
+import argparse
+import time
+
+import numpy as np
+
+import wnutils.xml as wx
+
+
+def make_nuclides(count):
+    nuclides = {}
+    z = 0
+    while len(nuclides) < count:
+        z += 1
+        for a in range(z, 3 * z + 1):
+            name = f"z{z}a{a}"
+            nuclides[name] = {
+                "z": z,
+                "a": a,
+                "state": "",
+                "source": "benchmark",
+                "mass excess": 0.0,
+                "spin": 0.0,
+                "t9": np.array([1.0, 2.0]),
+                "partf": np.array([1.0, 1.1]),
+            }
+            if len(nuclides) == count:
+                break
+    return nuclides
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument(
+        "counts",
+        nargs="*",
+        type=int,
+        default=[1000, 2000, 4000, 8000],
+        help="numbers of nuclides to set",
+    )
+    args = parser.parse_args()
+
+    for count in args.counts:
+        nuclides = make_nuclides(count)
+        start = time.perf_counter()
+        wx.New_Xml("nuclear_data").set_nuclide_data(nuclides)
+        elapsed = time.perf_counter() - start
+        print(
+            f"{count:8d} nuclides: {elapsed:8.3f} s "
+            f"({1.0e6 * elapsed / count:6.1f} us per nuclide)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -16,11 +16,18 @@ from wnutils.__about__ import (
 __all__ = [
     "Base",
     "H5",
+    "Mass_Fractions_Cube",
     "Multi_H5",
     "Multi_Xml",
+    "Network",
     "New_H5",
     "New_Xml",
+    "Partition_Functions",
+    "Rate_Engine",
     "Reaction",
+    "Reaction_Index",
+    "Streaming_New_Xml",
+    "Streaming_Xml",
     "Xml",
     "validate",
     "__author__",
@@ -33,11 +40,18 @@ __all__ = [
 _LAZY_IMPORTS = {
     "Base": ("wnutils.base", "Base"),
     "H5": ("wnutils.h5", "H5"),
+    "Mass_Fractions_Cube": ("wnutils.h5", "Mass_Fractions_Cube"),
     "Multi_H5": ("wnutils.multi_h5", "Multi_H5"),
     "Multi_Xml": ("wnutils.multi_xml", "Multi_Xml"),
+    "Network": ("wnutils.network", "Network"),
     "New_H5": ("wnutils.h5", "New_H5"),
     "New_Xml": ("wnutils.xml", "New_Xml"),
+    "Partition_Functions": ("wnutils.network", "Partition_Functions"),
+    "Rate_Engine": ("wnutils.network", "Rate_Engine"),
     "Reaction": ("wnutils.xml", "Reaction"),
+    "Reaction_Index": ("wnutils.network", "Reaction_Index"),
+    "Streaming_New_Xml": ("wnutils.xml", "Streaming_New_Xml"),
+    "Streaming_Xml": ("wnutils.xml", "Streaming_Xml"),
     "Xml": ("wnutils.xml", "Xml"),
     "validate": ("wnutils.xml", "validate"),
 }
@@ -1,5 +1,9 @@
 """Module providing h5 classes."""
 
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from itertools import repeat
+from types import MappingProxyType
 import warnings
 import matplotlib as mpl
 import matplotlib.pyplot as plt
@@ -11,6 +15,177 @@ with warnings.catch_warnings():
     warnings.filterwarnings("ignore", category=FutureWarning)
     import h5py
 
+# Target size in bytes of an automatically chosen dataset chunk.
+_CHUNK_BYTES = 64 * 1024
+
+# Name of the top-level group holding the time and property index.
+_GROUP_INDEX = "Group Index"
+
+# Default budget in bytes of the cache of decoded group data in H5.
+_CACHE_BYTES = 128 * 1024 * 1024
+
+
+def _decode_strings(data):
+    return np.char.decode(np.asarray(data).astype(np.bytes_), "ascii")
+
+
+def _get_property_name(p_0, p_1, p_2):
+    if p_1 == "0" and p_2 == "0":
+        return p_0
+    if p_1 != "0" and p_2 == "0":
+        return (p_0, p_1)
+    return (p_0, p_1, p_2)
+
+
+def _is_float_string(value):
+    try:
+        return str(float(value)) == value
+    except ValueError:
+        return False
+
+
+def _find_zone_index(zone_labels, zone):
+    if not (
+        isinstance(zone, tuple)
+        and len(zone) == 3
+        and all(isinstance(label, str) for label in zone)
+    ):
+        raise KeyError(zone)
+    fields = zone_labels.dtype.names[:3]
+    matches = np.flatnonzero(
+        np.logical_and.reduce(
+            [
+                zone_labels[field] == label.encode("ascii")
+                for field, label in zip(fields, zone)
+            ]
+        )
+    )
+    if len(matches) == 0:
+        raise KeyError(zone)
+    return matches[-1]
+
+
+# The low-level interface avoids the high-level dataset and selection
+# machinery, whose cost dominates reads of a small table or a single row.
+
+
+def _read_dataset(file_id, path):
+    dataset = h5py.h5d.open(file_id, path.encode())
+    result = np.empty(dataset.shape, dataset.dtype)
+    dataset.read(h5py.h5s.ALL, h5py.h5s.ALL, result)
+    return result
+
+
+def _get_runs(index):
+    return [
+        (int(run[0]), len(run))
+        for run in np.split(index, np.flatnonzero(np.diff(index) != 1) + 1)
+    ]
+
+
+def _read_mass_fractions_block(file_id, group, rows, columns, out):
+    # The rows and columns are sorted, unique indices.  Each run of
+    # consecutive rows and columns is one hyperslab, so only the selected
+    # elements are read.
+    if out.size == 0:
+        return
+    dataset = h5py.h5d.open(
+        file_id, ("/" + group + "/Mass Fractions").encode()
+    )
+    if dataset.shape[0] <= rows[-1] or dataset.shape[1] <= columns[-1]:
+        raise ValueError(
+            f"The mass fractions of group {group!r} have shape "
+            f"{dataset.shape}, which does not cover the selection."
+        )
+    file_space = dataset.get_space()
+    file_space.select_none()
+    column_runs = _get_runs(columns)
+    for row, n_rows in _get_runs(rows):
+        for column, n_columns in column_runs:
+            file_space.select_hyperslab(
+                (row, column), (n_rows, n_columns), op=h5py.h5s.SELECT_OR
+            )
+    dataset.read(h5py.h5s.create_simple(out.shape), file_space, out)
+
+
+def _read_zone_rows(file, groups, zone, columns):
+    result = np.empty((len(groups), len(columns)))
+
+    with h5py.File(file, "r") as h5file:
+        for i, group in enumerate(groups):
+            zone_index = _find_zone_index(
+                _read_dataset(h5file.id, "/" + group + "/Zone Labels"), zone
+            )
+            _read_mass_fractions_block(
+                h5file.id, group, [zone_index], columns, result[i : i + 1]
+            )
+
+    return result
+
+
+def _get_nbytes(value):
+    if isinstance(value, np.ndarray):
+        return value.nbytes
+    if isinstance(value, dict):
+        return sum(
+            _get_nbytes(key) + _get_nbytes(item) for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return sum(_get_nbytes(item) for item in value)
+    if isinstance(value, str):
+        return len(value)
+    return 0
+
+
+class _Group_Cache:
+    """A least-recently-used cache of decoded group data bounded in bytes."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self._entries = OrderedDict()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key, load):
+        """Return the value for key, loading it on a miss."""
+        if key in self._entries:
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return self._entries[key][0]
+
+        self.misses += 1
+        value = load()
+        self._entries[key] = (value, 0)
+        self.add_bytes(key, _get_nbytes(value))
+        return value
+
+    def add_bytes(self, key, nbytes):
+        """Charge additional bytes to a cached value and evict as needed."""
+        if key not in self._entries:
+            return
+
+        value, size = self._entries[key]
+        self._entries[key] = (value, size + nbytes)
+        self.nbytes += nbytes
+
+        while self.nbytes > self.max_bytes and self._entries:
+            _, (_, size) = self._entries.popitem(last=False)
+            self.nbytes -= size
+
+    def clear(self):
+        """Remove all values and reset the statistics."""
+        self._entries.clear()
+        self.nbytes = 0
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, key):
+        return key in self._entries
+
 
 class H5(wnb.Base):
     """A class for reading and plotting webnucleo HDF5 files.
@@ -21,13 +196,26 @@ class H5(wnb.Base):
     Args:
         ``file`` (:obj:`str`): The name of the hdf5 file.
 
+        ``cache_bytes`` (:obj:`int`, optional): The number of bytes of
+        decoded group mass fractions and properties, and of the zone
+        property and plotted mass fraction histories, to keep in memory.  The least recently
+        used entries are dropped first.  Zero disables the
+        cache.  Defaults to 128 MiB.
+
     """
 
-    def __init__(self, file):
+    def __init__(self, file, cache_bytes=_CACHE_BYTES):
+        if cache_bytes < 0:
+            raise ValueError("cache_bytes must not be negative.")
+
         self._h5file = h5py.File(file, "r")
+        self._nuclide_table = None
+        self._nuclide_indices = None
         self._nuclide_data_cache = None
         self._zone_labels_cache = {}
         self._zone_label_indexes = {}
+        self._group_cache = _Group_Cache(cache_bytes)
+        self._group_index = None
 
     def close(self):
         """Close the underlying HDF5 file."""
@@ -39,26 +227,167 @@ class H5(wnb.Base):
     def __exit__(self, _exc_type, _exc_value, _traceback):
         self.close()
 
-    def _get_group_zone_property_hash(self, group, zone_index):
+    def get_cache_info(self):
+        """Method to return statistics of the cache of decoded group data.
+
+        Returns:
+            :obj:`dict`: A dictionary giving the number of cache hits and
+            misses, the number of cached entries, and the bytes used by and
+            allowed for the cache.
+
+        """
+
+        return {
+            "hits": self._group_cache.hits,
+            "misses": self._group_cache.misses,
+            "entries": len(self._group_cache),
+            "bytes": self._group_cache.nbytes,
+            "max bytes": self._group_cache.max_bytes,
+        }
+
+    def clear_cache(self):
+        """Method to empty the cache of decoded group data.
+
+        Returns:
+            On successful return, the cached group mass fractions and
+            properties and zone property and mass fraction histories have
+            been released and the cache statistics reset.
+
+        """
+
+        self._group_cache.clear()
+
+    def _get_group_mass_fractions_array(self, group):
+        return self._group_cache.get(
+            ("mass fractions", group),
+            lambda: self._h5file["/" + group + "/Mass Fractions"][()],
+        )
+
+    def _read_property_table(self, group):
+        properties = self._h5file["/" + group + "/Zone Properties"]
+
+        if "Names" not in properties:
+            n_zones = len(self._h5file["/" + group + "/Zone Labels"])
+            return {"layout": None, "zones": [None] * n_zones}
+
+        result = {"layout": {}}
+        for kind, names in (
+            ("Values", "Names"),
+            ("String Values", "String Names"),
+        ):
+            if names not in properties:
+                continue
+            name_data = properties[names][()]
+            for j, name in enumerate(
+                zip(
+                    *(
+                        _decode_strings(name_data[field]).tolist()
+                        for field in ("Name", "Tag 1", "Tag 2")
+                    )
+                )
+            ):
+                result["layout"][_get_property_name(*name)] = (
+                    kind,
+                    j,
+                    len(result["layout"]),
+                )
+
+        result["Values"] = properties["Values"][()]
+        if "String Values" in properties:
+            result["String Values"] = _decode_strings(
+                properties["String Values"][()]
+            )
+        if "Present" in properties:
+            result["Present"] = properties["Present"][()]
+
+        return result
+
+    def _get_property_table(self, group):
+        return self._group_cache.get(
+            ("properties", group), lambda: self._read_property_table(group)
+        )
+
+    def _read_zone_property_hash(self, group, zone_index):
 
         properties = self._h5file[
             "/" + group + "/Zone Properties/" + str(zone_index)
-        ]
+        ][()]
+
+        fields = (
+            _decode_strings(properties[field]).tolist()
+            for field in properties.dtype.names[:4]
+        )
+
+        return {
+            _get_property_name(p_0, p_1, p_2): value
+            for p_0, p_1, p_2, value in zip(*fields)
+        }
+
+    def _get_group_zone_property_hash(self, group, zone_index):
+
+        return self._get_table_zone_property_hash(
+            group, self._get_property_table(group), zone_index
+        )
+
+    def _get_table_zone_property_hash(self, group, table, zone_index):
+
+        if table["layout"] is None:
+            if table["zones"][zone_index] is None:
+                table["zones"][zone_index] = self._read_zone_property_hash(
+                    group, zone_index
+                )
+                self._group_cache.add_bytes(
+                    ("properties", group),
+                    _get_nbytes(table["zones"][zone_index]),
+                )
+            return table["zones"][zone_index]
+
+        present = table.get("Present")
 
         result = {}
+        for name, (kind, j, k) in table["layout"].items():
+            if present is not None and not present[zone_index, k]:
+                continue
+            value = table[kind][zone_index, j]
+            result[name] = str(float(value)) if kind == "Values" else value
+
+        return result
 
+    def _get_group_property_columns(self, group, properties, as_floats):
+        table = self._get_property_table(group)
+
+        if table["layout"] is None:
+            zones = [
+                self._get_table_zone_property_hash(group, table, i)
+                for i in range(len(table["zones"]))
+            ]
+            result = {
+                my_property: [zone[my_property] for zone in zones]
+                for my_property in properties
+            }
+            if as_floats:
+                return {
+                    key: np.array(value, np.float64)
+                    for key, value in result.items()
+                }
+            return result
+
+        present = table.get("Present")
+
+        result = {}
         for my_property in properties:
-            p_0 = my_property[0].decode("ascii")
-            p_1 = my_property[1].decode("ascii")
-            p_2 = my_property[2].decode("ascii")
-            name = ""
-            if p_1 == "0" and p_2 == "0":
-                name = p_0
-            elif p_1 != "0" and p_2 == "0":
-                name = (p_0, p_1)
+            if my_property not in table["layout"]:
+                raise KeyError(my_property)
+            kind, j, k = table["layout"][my_property]
+            if present is not None and not present[:, k].all():
+                raise KeyError(my_property)
+            column = table[kind][:, j]
+            if as_floats:
+                result[my_property] = column.astype(np.float64)
+            elif kind == "Values":
+                result[my_property] = [str(x) for x in column.tolist()]
             else:
-                name = (p_0, p_1, p_2)
-            result[name] = my_property[3].decode("ascii")
+                result[my_property] = column.tolist()
 
         return result
 
@@ -75,14 +404,16 @@ class H5(wnb.Base):
         """
 
         if group not in self._zone_labels_cache:
-            zone_labels = self._h5file["/" + group + "/Zone Labels"]
+            zone_labels = _read_dataset(
+                self._h5file.id, "/" + group + "/Zone Labels"
+            )
             self._zone_labels_cache[group] = tuple(
-                (
-                    zone_label[0].decode("ascii"),
-                    zone_label[1].decode("ascii"),
-                    zone_label[2].decode("ascii"),
+                zip(
+                    *(
+                        _decode_strings(zone_labels[field]).tolist()
+                        for field in zone_labels.dtype.names[:3]
+                    )
                 )
-                for zone_label in zone_labels
             )
 
         return list(self._zone_labels_cache[group])
@@ -109,30 +440,175 @@ class H5(wnb.Base):
         result = []
 
         for group_name in self._h5file:
-            if group_name != "Nuclide Data":
+            if group_name not in ("Nuclide Data", _GROUP_INDEX):
                 result.append(group_name)
 
         return result
 
-    def _get_nuclide_data_array(self):
+    def _read_group_index(self, index):
+        stored = self._h5file[_GROUP_INDEX]
+        groups = stored["Groups"][()]
+        rows = {
+            name: i
+            for i, name in enumerate(_decode_strings(groups["Name"]).tolist())
+        }
+        if set(rows) != set(index["groups"]):
+            return
+
+        rows = [rows[group] for group in index["groups"]]
+        labels = stored["Zone Labels"][()]
+        index["labels"] = {
+            label: j
+            for j, label in enumerate(
+                zip(
+                    *(
+                        _decode_strings(labels[field]).tolist()
+                        for field in ("Label 1", "Label 2", "Label 3")
+                    )
+                )
+            )
+        }
+        index["times"] = groups["Time"][rows]
+
+        names = stored["Names"][()]
+        values = stored["Values"][()]
+        for k, name in enumerate(
+            zip(
+                *(
+                    _decode_strings(names[field]).tolist()
+                    for field in ("Name", "Tag 1", "Tag 2")
+                )
+            )
+        ):
+            index["columns"][_get_property_name(*name)] = values[rows, :, k]
+
+    def _get_group_index(self):
+        if self._group_index is None:
+            index = {
+                "groups": self.get_iterable_groups(),
+                "labels": None,
+                "times": None,
+                "columns": {},
+            }
+            if _GROUP_INDEX in self._h5file:
+                self._read_group_index(index)
+            self._group_index = index
 
-        result = []
+        return self._group_index
 
-        nuclide_data = self._h5file["/Nuclide Data"]
+    def get_group_times(self):
+        """Method to return the time of each group in an hdf5 file.
 
-        for nuc in nuclide_data:
-            data = {}
-            data["name"] = nuc["Name"].decode("ascii")
-            data["z"] = nuc["Z"]
-            data["a"] = nuc["A"]
-            data["n"] = data["a"] - data["z"]
-            data["source"] = nuc["Source"].decode("ascii")
-            data["state"] = nuc["State"].decode("ascii")
-            data["mass excess"] = nuc["Mass Excess"]
-            data["spin"] = nuc["Spin"]
-            result.append(data)
+        The times are read from the file's group index when it has one and
+        otherwise from the first zone of each group, once.
 
-        return result
+        Returns:
+            :obj:`numpy.array`: An array giving the time of each group, in
+            the order returned by :meth:`get_iterable_groups`.  The time of a
+            group without a numerical time property is NaN.
+
+        """
+
+        index = self._get_group_index()
+
+        if index["times"] is None:
+            index["times"] = np.full(len(index["groups"]), np.nan)
+            for i, group in enumerate(index["groups"]):
+                if len(self.get_zone_labels_for_group(group)) == 0:
+                    continue
+                try:
+                    index["times"][i] = float(
+                        self._get_group_zone_property_hash(group, 0)["time"]
+                    )
+                except (KeyError, ValueError):
+                    pass
+
+        return index["times"].copy()
+
+    def get_group_for_time(self, time):
+        """Method to return the group whose time is closest to a time.
+
+        Args:
+            ``time`` (:obj:`float`): The time.
+
+        Returns:
+            :obj:`str`: The name of the group whose time is closest to
+            ``time``.  Of groups equally close, the first is returned.
+
+        """
+
+        times = self.get_group_times()
+
+        if np.isnan(times).all():
+            raise ValueError("No group has a time.")
+
+        return self._get_group_index()["groups"][
+            int(np.nanargmin(np.abs(times - time)))
+        ]
+
+    def get_nuclide_table(self):
+        """Method to return the nuclide data as a structured array.
+
+        The array is read once and shared by all callers, so it is
+        read-only.
+
+        Returns:
+
+            :obj:`numpy.ndarray`: A structured array with one record per
+            nuclide, in index order, and fields name, z, a, n, source,
+            state, mass excess, and spin.
+
+        """
+
+        if self._nuclide_table is None:
+            data = self._h5file["/Nuclide Data"][()]
+
+            columns = {
+                "name": _decode_strings(data["Name"]),
+                "z": data["Z"],
+                "a": data["A"],
+                "n": data["A"] - data["Z"],
+                "source": _decode_strings(data["Source"]),
+                "state": _decode_strings(data["State"]),
+                "mass excess": data["Mass Excess"],
+                "spin": data["Spin"],
+            }
+
+            table = np.empty(
+                len(data),
+                dtype=[(key, value.dtype) for key, value in columns.items()],
+            )
+            for key, value in columns.items():
+                table[key] = value
+            table.flags.writeable = False
+
+            self._nuclide_table = table
+
+        return self._nuclide_table
+
+    def get_nuclide_indices(self):
+        """Method to return the index of each nuclide in an hdf5 file.
+
+        Returns:
+
+            :obj:`mapping`: A read-only mapping of the nuclide names to
+            their indices, which give their rows in
+            :meth:`get_nuclide_table` and their columns in the group mass
+            fractions.
+
+        """
+
+        if self._nuclide_indices is None:
+            self._nuclide_indices = MappingProxyType(
+                {
+                    name: i
+                    for i, name in enumerate(
+                        self.get_nuclide_table()["name"].tolist()
+                    )
+                }
+            )
+
+        return self._nuclide_indices
 
     def get_nuclide_data(self):
         """Method to return nuclide data from an hdf5 file.
@@ -146,17 +622,17 @@ class H5(wnb.Base):
         """
 
         if self._nuclide_data_cache is None:
-            nuclide_data = self._get_nuclide_data_array()
+            table = self.get_nuclide_table()
             self._nuclide_data_cache = {}
 
-            for i, nuc in enumerate(nuclide_data):
-                self._nuclide_data_cache[nuc["name"]] = {
+            for i, nuc in enumerate(table):
+                self._nuclide_data_cache[str(nuc["name"])] = {
                     "index": i,
                     "z": nuc["z"],
                     "a": nuc["a"],
                     "n": nuc["n"],
-                    "source": nuc["source"],
-                    "state": nuc["state"],
+                    "source": str(nuc["source"]),
+                    "state": str(nuc["state"]),
                     "mass excess": nuc["mass excess"],
                     "spin": nuc["spin"],
                 }
@@ -166,22 +642,69 @@ class H5(wnb.Base):
             for name, data in self._nuclide_data_cache.items()
         }
 
-    def get_group_mass_fractions(self, group):
+    def get_group_mass_fractions(self, group, memmap=False):
         """Method to return mass fractions from a group in an hdf5 file.
 
         Args:
             ``group`` (:obj:`str`): The name of the group.
 
+            ``memmap`` (:obj:`bool`, optional): Whether to return a
+            read-only :obj:`numpy.memmap` of the data in the file instead of
+            the dataset.  Processes mapping the same file share the
+            operating system's page cache.  Datasets that are chunked,
+            filtered, or otherwise not stored as one contiguous block are
+            returned as datasets.  Defaults to False.
+
         Returns:
             A 2d hdf5
-            `dataset <https://docs.h5py.org/en/stable/high/dataset.html>`_.
-            The first index indicates the zone and the second the species.
+            `dataset <https://docs.h5py.org/en/stable/high/dataset.html>`_
+            or :obj:`numpy.memmap`.  The first index indicates the zone and
+            the second the species.
 
         """
 
-        return self._h5file["/" + group + "/Mass Fractions"]
+        dataset = self._h5file["/" + group + "/Mass Fractions"]
+
+        if memmap:
+            offset = self._get_contiguous_offset(dataset)
+            if offset is not None:
+                return np.memmap(
+                    self._h5file.filename,
+                    mode="r",
+                    dtype=dataset.dtype,
+                    shape=dataset.shape,
+                    offset=offset,
+                )
+
+        return dataset
+
+    def _get_contiguous_offset(self, dataset):
+        if (
+            dataset.chunks is not None
+            or dataset.external
+            or dataset.dtype.kind not in "biuf"
+            or self._h5file.driver not in ("sec2", "stdio")
+            or self._h5file.userblock_size != 0
+        ):
+            return None
 
-    def get_zone_mass_fractions_in_groups(self, zone, species):
+        return dataset.id.get_offset()
+
+    def get_mass_fractions_cube(self):
+        """Method to return a lazy view of the mass fractions in all groups.
+
+        Returns:
+            :obj:`wnutils.h5.Mass_Fractions_Cube`: A three-dimensional
+            array-like view of the mass fractions.  The first index gives
+            the group, in the order returned by :meth:`get_iterable_groups`,
+            the second the zone, and the third the species.  Data are read
+            from the file only when the view is indexed.
+
+        """
+
+        return Mass_Fractions_Cube(self._h5file, self.get_iterable_groups())
+
+    def get_zone_mass_fractions_in_groups(self, zone, species, workers=None):
         """Method to return zone mass fractions in all groups.
 
         Args:
@@ -192,31 +715,64 @@ class H5(wnb.Base):
             ``species`` (:obj:`list`): A list of strings giving the species
             whose mass fractions are to be retrieved.
 
+            ``workers`` (:obj:`int`, optional): The number of worker
+            processes among which the groups are split.  Each worker opens
+            the file itself and reads a contiguous range of groups.
+            Defaults to reading the groups serially.
+
         Returns:
             :obj:`dict`: A dictionary of :obj:`numpy.array` giving the
             mass fractions in the groups.
 
         """
 
-        nuclide_hash = self.get_nuclide_data()
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be a positive integer.")
+
+        nuclide_indices = self.get_nuclide_indices()
         groups = self.get_iterable_groups()
         result = {name: np.empty(len(groups)) for name in species}
 
         if not result:
             return result
 
-        columns = {name: nuclide_hash[name]["index"] for name in result}
-        selected_columns = sorted(set(columns.values()))
-        column_positions = {
-            column: i for i, column in enumerate(selected_columns)
-        }
+        # Only the selected species of each group's row are read, directly
+        # into a preallocated groups by species buffer.
+        columns, positions = np.unique(
+            [nuclide_indices[name] for name in result], return_inverse=True
+        )
+        buffer = np.empty((len(groups), len(columns)))
 
-        for i, group_name in enumerate(groups):
-            zone_index = self._get_group_zone_labels_hash(group_name)[zone]
-            mass_fractions = self.get_group_mass_fractions(group_name)
-            values = mass_fractions[zone_index, selected_columns]
-            for name, column in columns.items():
-                result[name][i] = values[column_positions[column]]
+        if workers is not None and workers > 1 and len(groups) > 1:
+            parts = np.array_split(
+                np.array(groups, dtype=object), min(workers, len(groups))
+            )
+            with ProcessPoolExecutor(max_workers=len(parts)) as executor:
+                np.concatenate(
+                    list(
+                        executor.map(
+                            _read_zone_rows,
+                            repeat(self._h5file.filename),
+                            [list(part) for part in parts],
+                            repeat(zone),
+                            repeat(columns),
+                        )
+                    ),
+                    out=buffer,
+                )
+        else:
+            for i, group_name in enumerate(groups):
+                zone_index = self._get_group_zone_labels_hash(group_name)[zone]
+                _read_mass_fractions_block(
+                    self._h5file.id,
+                    group_name,
+                    [zone_index],
+                    columns,
+                    buffer[i : i + 1],
+                )
+
+        for name, position in zip(result, positions):
+            result[name] = buffer[:, position].copy()
 
         return result
 
@@ -237,11 +793,14 @@ class H5(wnb.Base):
         """
 
         zone_index = self._get_group_zone_labels_hash(group)[zone]
-        return self._get_group_zone_property_hash(group, zone_index)
+        return dict(self._get_group_zone_property_hash(group, zone_index))
 
     def get_zone_properties_in_groups(self, zone, properties):
         """Method to return zone properties in all groups.
 
+        The history of each property in a zone is kept in the cache of
+        decoded group data, so later calls for it do not reopen the groups.
+
         Args:
 
             ``zone`` (:obj:`tuple`): A three element tuple giving the three
@@ -256,16 +815,39 @@ class H5(wnb.Base):
 
         """
 
-        result = {}
+        missing = [
+            my_property
+            for my_property in properties
+            if ("zone properties", zone, my_property) not in self._group_cache
+        ]
+        series = self._read_zone_property_series(zone, missing)
 
-        for my_property in properties:
-            result[my_property] = []
+        def load(my_property):
+            if my_property not in series:
+                series.update(
+                    self._read_zone_property_series(zone, [my_property])
+                )
+            return series[my_property]
 
-        for group_name in self.get_iterable_groups():
-            zone_index = self._get_group_zone_labels_hash(group_name)[zone]
-            _p = self._get_group_zone_property_hash(group_name, zone_index)
-            for my_property in properties:
-                result[my_property].append(_p[my_property])
+        return {
+            my_property: list(
+                self._group_cache.get(
+                    ("zone properties", zone, my_property),
+                    lambda p=my_property: load(p),
+                )
+            )
+            for my_property in properties
+        }
+
+    def _read_zone_property_series(self, zone, properties):
+        result = {my_property: [] for my_property in properties}
+
+        if result:
+            for group_name in self.get_iterable_groups():
+                zone_index = self._get_group_zone_labels_hash(group_name)[zone]
+                _p = self._get_group_zone_property_hash(group_name, zone_index)
+                for my_property in properties:
+                    result[my_property].append(_p[my_property])
 
         return result
 
@@ -286,6 +868,22 @@ class H5(wnb.Base):
 
         """
 
+        index = self._get_group_index()
+
+        if index["labels"] is not None and zone in index["labels"]:
+            j = index["labels"][zone]
+            result = {}
+            for my_property in properties:
+                if my_property not in index["columns"]:
+                    break
+                result[my_property] = index["columns"][my_property][
+                    :, j
+                ].copy()
+                if np.isnan(result[my_property]).any():
+                    break
+            else:
+                return result
+
         result = {}
 
         props = self.get_zone_properties_in_groups(zone, properties)
@@ -311,24 +909,7 @@ class H5(wnb.Base):
 
         """
 
-        result = {}
-
-        for my_property in properties:
-            result[my_property] = []
-
-        zone_labels_hash = self._get_group_zone_labels_hash(group)
-
-        for zone_labels in self.get_zone_labels_for_group(group):
-            _p = self._get_group_zone_property_hash(
-                group,
-                zone_labels_hash[
-                    (zone_labels[0], zone_labels[1], zone_labels[2])
-                ],
-            )
-            for my_property in properties:
-                result[my_property].append(_p[my_property])
-
-        return result
+        return self._get_group_property_columns(group, properties, False)
 
     def get_group_properties_in_zones_as_floats(self, group, properties):
         """Method to return properties in all zones for a group as floats.
@@ -346,14 +927,7 @@ class H5(wnb.Base):
 
         """
 
-        result = {}
-
-        props = self.get_group_properties_in_zones(group, properties)
-
-        for key, value in props.items():
-            result[key] = np.array(value, np.float64)
-
-        return result
+        return self._get_group_property_columns(group, properties, True)
 
     def plot_zone_property_vs_property(
         self,
@@ -469,9 +1043,9 @@ class H5(wnb.Base):
 
         plots = []
 
-        _m = self.get_group_mass_fractions(group)
+        _m = self._get_group_mass_fractions_array(group)
 
-        nuclide_data = self.get_nuclide_data()
+        nuclide_indices = self.get_nuclide_indices()
 
         if use_latex_names:
             latex_names = self.get_latex_names(species)
@@ -486,7 +1060,7 @@ class H5(wnb.Base):
                     _p = self._merge_dicts(_p, {"label": latex_names[s_sp]})
                 else:
                     _p = self._merge_dicts(_p, {"label": s_sp})
-            plots.append(plt.plot(_m[:, nuclide_data[s_sp]["index"]], **_p))
+            plots.append(plt.plot(_m[:, nuclide_indices[s_sp]], **_p))
 
         if len(species) != 1:
             plt.legend()
@@ -608,15 +1182,15 @@ class H5(wnb.Base):
         plots = []
 
         _x = self.get_group_properties_in_zones_as_floats(group, [prop])[prop]
-        _m = self.get_group_mass_fractions(group)
+        _m = self._get_group_mass_fractions_array(group)
 
-        nuclide_data = self.get_nuclide_data()
+        nuclide_indices = self.get_nuclide_indices()
 
         if use_latex_names:
             latex_names = self.get_latex_names(species)
 
         for i, s_sp in enumerate(species):
-            _y = _m[:, nuclide_data[s_sp]["index"]]
+            _y = _m[:, nuclide_indices[s_sp]]
             if plotParams is None:
                 _p = {}
             else:
@@ -790,7 +1364,10 @@ class H5(wnb.Base):
         self.set_plot_params(mpl, rcParams)
 
         _x = self.get_zone_properties_in_groups_as_floats(zone, [prop])[prop]
-        _m = self.get_zone_mass_fractions_in_groups(zone, species)
+        _m = self._group_cache.get(
+            ("zone mass fractions", zone, tuple(species)),
+            lambda: self.get_zone_mass_fractions_in_groups(zone, species),
+        )
 
         if yfactor:
             if len(yfactor) != len(species):
@@ -908,7 +1485,7 @@ class H5(wnb.Base):
 
         self.set_plot_params(mpl, rcParams)
 
-        nuclide_data = self.get_nuclide_data()
+        nuclide_indices = self.get_nuclide_indices()
 
         groups = self.get_iterable_groups()
 
@@ -917,7 +1494,7 @@ class H5(wnb.Base):
 
         def updatefig(i):
             fig.clear()
-            _x = self.get_group_mass_fractions(groups[i])
+            _x = self._get_group_mass_fractions_array(groups[i])
             for j, s_sp in enumerate(species):
                 if plotParams is None:
                     _p = {}
@@ -936,11 +1513,11 @@ class H5(wnb.Base):
                     )
                     plt.plot(
                         my_prop[x_property] / xfactor,
-                        _x[:, nuclide_data[s_sp]["index"]],
+                        _x[:, nuclide_indices[s_sp]],
                         **_p,
                     )
                 else:
-                    plt.plot(_x[:, nuclide_data[s_sp]["index"]], **_p)
+                    plt.plot(_x[:, nuclide_indices[s_sp]], **_p)
 
             if title_func:
                 t_f = title_func(i)
@@ -972,6 +1549,144 @@ class H5(wnb.Base):
         return anim
 
 
+def _get_cube_index(key, size):
+    if isinstance(key, (int, np.integer)):
+        return int(np.arange(size)[key])
+    index = np.arange(size)[key]
+    if index.ndim != 1:
+        raise IndexError("The cube indices must be one-dimensional.")
+    return index
+
+
+class Mass_Fractions_Cube(wnb.Base):
+    """A class giving a lazy view of the mass fractions in all hdf5 groups.
+
+    The view has shape groups by zones by species and supports NumPy-style
+    indexing with integers, slices, and one-dimensional integer or boolean
+    arrays, such as ``cube[:, zone, species]`` or ``cube[100:200]``.  At most
+    one index may be an array; an :obj:`IndexError` is raised otherwise.
+    Only the selected zones and species of each selected group are read, so
+    the full cube is never held in memory.  Instances are created with
+    :meth:`wnutils.h5.H5.get_mass_fractions_cube`.
+
+    Args:
+        ``h5file``: The open h5py
+        `file <https://docs.h5py.org/en/stable/high/file.html>`_.
+
+        ``groups`` (:obj:`list`): A list of strings giving the names of the
+        groups along the first axis.
+
+    """
+
+    def __init__(self, h5file, groups):
+        self._h5file = h5file
+        self._groups = list(groups)
+
+        shape = (0, len(h5file["/Nuclide Data"]))
+        self.dtype = np.dtype(np.float64)
+        for i, group in enumerate(self._groups):
+            dataset = h5py.h5d.open(
+                h5file.id, ("/" + group + "/Mass Fractions").encode()
+            )
+            if i == 0:
+                shape = dataset.shape
+                self.dtype = dataset.dtype
+            elif dataset.shape != shape:
+                raise ValueError(
+                    f"The mass fractions of group {group!r} have shape "
+                    f"{dataset.shape}, but those of group "
+                    f"{self._groups[0]!r} have shape {shape}."
+                )
+
+        self.shape = (len(self._groups),) + tuple(shape)
+
+    @property
+    def ndim(self):
+        """The number of dimensions, three."""
+        return 3
+
+    def __len__(self):
+        return self.shape[0]
+
+    def __array__(self, dtype=None, copy=None):
+        if copy is False:
+            raise ValueError("The cube cannot be viewed without a copy.")
+        result = self[:]
+        return result if dtype is None else result.astype(dtype)
+
+    def get_groups(self):
+        """Method to return the groups along the first axis.
+
+        Returns:
+            :obj:`list`: A list of strings giving the names of the groups.
+
+        """
+
+        return list(self._groups)
+
+    def __getitem__(self, key):
+        if not isinstance(key, tuple):
+            key = (key,)
+        if any(k is Ellipsis for k in key):
+            i = next(i for i, k in enumerate(key) if k is Ellipsis)
+            key = key[:i] + (slice(None),) * (4 - len(key)) + key[i + 1 :]
+        if len(key) > 3:
+            raise IndexError("Too many indices for the mass fractions cube.")
+        key = key + (slice(None),) * (3 - len(key))
+
+        arrays = [
+            i
+            for i, k in enumerate(key)
+            if not isinstance(k, (slice, int, np.integer))
+        ]
+        if len(arrays) > 1:
+            raise IndexError(
+                "The mass fractions cube accepts at most one array index."
+            )
+
+        groups, zones, species = (
+            _get_cube_index(k, size) for k, size in zip(key, self.shape)
+        )
+        zones, zone_index = np.unique(zones, return_inverse=True)
+        species, species_index = np.unique(species, return_inverse=True)
+
+        result = np.empty(
+            (np.size(groups), len(zones), len(species)), dtype=self.dtype
+        )
+
+        if result.size > 0:
+            for i, group in enumerate(np.atleast_1d(groups)):
+                _read_mass_fractions_block(
+                    self._h5file.id,
+                    self._groups[group],
+                    zones,
+                    species,
+                    result[i],
+                )
+
+        result = result[:, zone_index.reshape(-1)][
+            :, :, species_index.reshape(-1)
+        ]
+        result = result[
+            tuple(
+                0 if isinstance(k, (int, np.integer)) else slice(None)
+                for k in key
+            )
+        ]
+
+        # As in NumPy, an array index separated by a slice from an integer
+        # index gives the first axis of the result.
+        advanced = [i for i, k in enumerate(key) if not isinstance(k, slice)]
+        if arrays and advanced[-1] - advanced[0] >= len(advanced):
+            result = np.moveaxis(
+                result,
+                sum(isinstance(k, slice) for k in key[: arrays[0]]),
+                0,
+            )
+
+        return result
+
+
 class New_H5(wnb.Base):
     """A class for creating webnucleo hdf5 files.
 
@@ -983,9 +1698,83 @@ class New_H5(wnb.Base):
 
            ``nucs`` (:obj:`dict`): A dictionary of nuclide data.
 
+           ``chunks`` (:obj:`bool` or :obj:`tuple`, optional): The chunk\
+            shape of the mass fraction datasets, or True to choose tiles\
+            automatically.  Defaults to contiguous datasets unless a filter\
+            is requested, in which case tiles are chosen automatically.
+
+           ``compression`` (:obj:`str`, optional): The compression filter,\
+            either "gzip" or "lzf".  Defaults to no compression.
+
+           ``compression_opts`` (:obj:`int`, optional): The gzip\
+            compression level, from 0 to 9.
+
+           ``shuffle`` (:obj:`bool`, optional): Whether to apply the byte\
+            shuffle filter, which improves the compression of floating-point\
+            data.  Defaults to False.
+
+           ``fletcher32`` (:obj:`bool`, optional): Whether to store a\
+            checksum of each chunk.  Defaults to False.
+
+           ``property_layout`` (:obj:`str`, optional): The layout of the\
+            zone properties in each group.  With "zones", each zone's\
+            properties are a separate dataset of strings.  With "columnar",\
+            the properties of all zones are stored in one table of names and\
+            one two-dimensional array of values, with properties that are\
+            not numbers kept in a parallel array of strings.  Defaults to\
+            "zones".
+
+           ``index_properties`` (:obj:`list`, optional): A list of strings\
+            or tuples of up to three strings giving zone properties to\
+            record, together with each group's name, order, and time, in a\
+            top-level group index when the file is closed.  Readers then get\
+            these properties of a zone in all groups with a single read.\
+            Defaults to writing no index.
+
        """
 
-    def __init__(self, file, nucs):
+    def __init__(
+        self,
+        file,
+        nucs,
+        chunks=None,
+        compression=None,
+        compression_opts=None,
+        shuffle=False,
+        fletcher32=False,
+        property_layout="zones",
+        index_properties=None,
+    ):
+        if property_layout not in ("zones", "columnar"):
+            raise ValueError('property_layout must be "zones" or "columnar".')
+        if compression not in (None, "gzip", "lzf"):
+            raise ValueError('compression must be "gzip" or "lzf".')
+        if compression_opts is not None and compression != "gzip":
+            raise ValueError("compression_opts requires gzip compression.")
+        if chunks is False and (compression or shuffle or fletcher32):
+            raise ValueError("Filters require chunked datasets.")
+
+        self._dataset_options = {
+            "compression": compression,
+            "compression_opts": compression_opts,
+            "shuffle": shuffle,
+            "fletcher32": fletcher32,
+        }
+        if chunks is None and (compression or shuffle or fletcher32):
+            chunks = True
+        self._chunks = chunks
+        self._property_layout = property_layout
+
+        self._group_index = None
+        if index_properties is not None:
+            self._group_index = {
+                "names": ["time"]
+                + [prop for prop in index_properties if prop != "time"],
+                "groups": [],
+                "labels": {},
+                "values": [],
+            }
+
         self.file = h5py.File(file, "w")
         self.nucs = nucs
         self._add_nuclide_data(nucs)
@@ -998,7 +1787,11 @@ class New_H5(wnb.Base):
 
     def close(self):
         """Close the underlying HDF5 file."""
-        self.file.close()
+        try:
+            if self._group_index is not None and self.file:
+                self._write_group_index()
+        finally:
+            self.file.close()
 
     def __enter__(self):
         return self
@@ -1006,6 +1799,107 @@ class New_H5(wnb.Base):
     def __exit__(self, _exc_type, _exc_value, _traceback):
         self.close()
 
+    def _add_group_to_index(self, group, labels, get_zone_properties):
+        if self._group_index is None:
+            return
+
+        index = self._group_index
+        values = {}
+        for i, label in enumerate(labels):
+            if not isinstance(label, tuple):
+                label = (label, "0", "0")
+            j = index["labels"].setdefault(label, len(index["labels"]))
+            values[j] = []
+            properties = get_zone_properties(i)
+            for prop in index["names"]:
+                try:
+                    # The value as read back from the group's string.
+                    values[j].append(float(str(properties[prop])))
+                except (KeyError, ValueError):
+                    values[j].append(np.nan)
+
+        index["groups"].append(group)
+        index["values"].append(values)
+
+    def _write_group_index(self):
+        index = self._group_index
+        d_t = h5py.string_dtype()
+
+        values = np.full(
+            (
+                len(index["groups"]),
+                len(index["labels"]),
+                len(index["names"]),
+            ),
+            np.nan,
+        )
+        times = np.full(len(index["groups"]), np.nan)
+        for i, group_values in enumerate(index["values"]):
+            for j, zone_values in group_values.items():
+                values[i, j] = zone_values
+            if group_values:
+                times[i] = values[i, next(iter(group_values)), 0]
+
+        g_i = self.file.create_group(_GROUP_INDEX)
+        g_i.create_dataset(
+            "Groups",
+            data=np.array(
+                list(zip(index["groups"], range(len(index["groups"])), times)),
+                dtype=[("Name", d_t), ("Order", "int"), ("Time", "float")],
+            ),
+        )
+        g_i.create_dataset(
+            "Zone Labels",
+            data=np.array(
+                list(index["labels"]),
+                dtype=[("Label 1", d_t), ("Label 2", d_t), ("Label 3", d_t)],
+            ),
+        )
+        g_i.create_dataset(
+            "Names",
+            data=np.array(
+                [self._get_property_record_name(p) for p in index["names"]],
+                dtype=[("Name", d_t), ("Tag 1", d_t), ("Tag 2", d_t)],
+            ),
+        )
+        # The index is read whole, so it is not chunked.
+        g_i.create_dataset("Values", data=values)
+
+    def _create_group(self, group):
+        if group == _GROUP_INDEX:
+            raise ValueError(f"{_GROUP_INDEX!r} is a reserved group name.")
+        return self.file.create_group(group)
+
+    def _get_chunks(self, shape, itemsize):
+        if not self._chunks or 0 in shape:
+            return None
+
+        if self._chunks is not True and len(self._chunks) == len(shape):
+            return tuple(
+                max(1, min(c, n)) for c, n in zip(self._chunks, shape)
+            )
+
+        # Square tiles bound the bytes read for both a zone (a row) and a
+        # species (a column); a short dimension passes its budget to the
+        # other.
+        budget = max(1, _CHUNK_BYTES // itemsize)
+        if len(shape) == 1:
+            return (min(shape[0], budget),)
+
+        side = int(np.sqrt(budget))
+        rows = min(shape[0], side)
+        columns = min(shape[1], max(side, budget // rows))
+        rows = min(shape[0], max(rows, budget // columns))
+        return (rows, columns)
+
+    def _create_dataset(self, parent, name, data):
+        chunks = self._get_chunks(data.shape, data.dtype.itemsize)
+        if chunks is None:
+            return parent.create_dataset(name, data=data)
+        return parent.create_dataset(
+            name, data=data, chunks=chunks, **self._dataset_options
+        )
+
     def _add_nuclide_data(self, nucs):
         d_t = h5py.string_dtype()
 
@@ -1038,7 +1932,7 @@ class New_H5(wnb.Base):
 
         my_data = np.array(records, dtype=my_type)
 
-        self.file.create_dataset("Nuclide Data", data=my_data)
+        self._create_dataset(self.file, "Nuclide Data", my_data)
 
     def _add_zone_labels_to_group(self, _g, zones):
 
@@ -1074,20 +1968,21 @@ class New_H5(wnb.Base):
             records = []
             props = zones[zone]["properties"]
             for prop in props:
-                tag1 = "0"
-                tag2 = "0"
-                value = str(props[prop])
-                if isinstance(prop, tuple):
-                    name = str(prop[0])
-                    tag1 = str(prop[1])
-                    if len(prop) == 3:
-                        tag2 = str(prop[2])
-                else:
-                    name = str(prop)
-                records.append((name, tag1, tag2, value))
+                records.append(
+                    self._get_property_record_name(prop) + (str(props[prop]),)
+                )
             my_data = np.array(records, dtype=my_type)
             g_p.create_dataset(str(i), data=my_data, dtype=my_type)
 
+    def _get_property_record_name(self, prop):
+        if isinstance(prop, tuple):
+            return (
+                str(prop[0]),
+                str(prop[1]) if len(prop) > 1 else "0",
+                str(prop[2]) if len(prop) > 2 else "0",
+            )
+        return (str(prop), "0", "0")
+
     def _add_zone_mass_fractions_to_group(self, _g, zones):
 
         my_data = np.zeros((len(zones), len(self.nucs)), dtype=float)
@@ -1097,7 +1992,169 @@ class New_H5(wnb.Base):
             for key in mass_fracs:
                 my_data[i, self.nuc_dict[key[0]]] = mass_fracs[key]
 
-        _g.create_dataset("Mass Fractions", data=my_data)
+        self._create_dataset(_g, "Mass Fractions", my_data)
+
+    def _add_zone_property_arrays_to_group(self, _g, n_zones, properties):
+        g_p = _g.create_group("Zone Properties")
+
+        d_t = h5py.string_dtype()
+
+        my_type = [
+            ("Name", d_t),
+            ("Tag 1", d_t),
+            ("Tag 2", d_t),
+            ("Value", d_t),
+        ]
+
+        my_data = np.array(
+            [
+                self._get_property_record_name(prop) + ("",)
+                for prop in properties
+            ],
+            dtype=my_type,
+        )
+        values = [
+            [str(x) for x in np.asarray(value, dtype=object).reshape(n_zones)]
+            for value in properties.values()
+        ]
+
+        for i in range(n_zones):
+            my_data["Value"] = [value[i] for value in values]
+            g_p.create_dataset(str(i), data=my_data, dtype=my_type)
+
+    def _add_zone_property_columns_to_group(self, _g, n_zones, properties):
+        g_p = _g.create_group("Zone Properties")
+
+        d_t = h5py.string_dtype()
+
+        name_type = [("Name", d_t), ("Tag 1", d_t), ("Tag 2", d_t)]
+
+        columns = {"Values": [], "String Values": []}
+        names = {"Values": [], "String Values": []}
+        present = {"Values": [], "String Values": []}
+
+        for prop, value in properties.items():
+            value = np.asarray(value, dtype=object).reshape(n_zones)
+            is_present = np.array([x is not None for x in value], dtype=bool)
+            strings = [str(x) for x in value[is_present]]
+            # A column is stored as floats only if every value reads back as
+            # the string the "zones" layout would store.
+            if all(_is_float_string(x) for x in strings):
+                column = np.full(n_zones, np.nan)
+                column[is_present] = [float(x) for x in strings]
+                kind = "Values"
+            else:
+                column = np.full(n_zones, "", dtype=object)
+                column[is_present] = strings
+                kind = "String Values"
+            columns[kind].append(column)
+            names[kind].append(self._get_property_record_name(prop))
+            present[kind].append(is_present)
+
+        g_p.create_dataset(
+            "Names", data=np.array(names["Values"], dtype=name_type)
+        )
+        self._create_dataset(
+            g_p,
+            "Values",
+            np.array(columns["Values"], dtype=float)
+            .reshape(len(columns["Values"]), n_zones)
+            .T.copy(),
+        )
+
+        if names["String Values"]:
+            g_p.create_dataset(
+                "String Names",
+                data=np.array(names["String Values"], dtype=name_type),
+            )
+            g_p.create_dataset(
+                "String Values",
+                data=np.array(columns["String Values"], dtype=object).T,
+                dtype=d_t,
+            )
+
+        # The columns follow "Names" and then "String Names".
+        present = present["Values"] + present["String Values"]
+        present = np.array(present, dtype=bool).reshape(len(present), n_zones)
+        if not present.all():
+            g_p.create_dataset("Present", data=present.T)
+
+    def add_group_from_arrays(
+        self, group, labels, species, mass_fractions, properties=None
+    ):
+        """Method to add a group to an hdf5 file from arrays.
+
+        Args:
+
+            ``group`` (:obj:`str`): A string giving the group name.
+
+            ``labels`` (:obj:`list`): A list of the zone labels, each a
+            string or a tuple of three strings.
+
+            ``species`` (:obj:`list`): A list of the species, each a
+            nuclide name or a tuple whose first element is the nuclide name.
+            Each species must be in the nuclide data of the file.
+
+            ``mass_fractions`` (:obj:`numpy.array`): A two-dimensional array
+            in which the first index gives the zone, in the order of
+            ``labels``, and the second the species, in the order of
+            ``species``.
+
+            ``properties`` (:obj:`dict`, optional): A dictionary of arrays
+            keyed by property name, each giving the property value in each
+            zone.  Defaults to no properties.
+
+        Returns:
+            On successful return, the group has been added to the
+            hdf5 file.
+
+        """
+
+        mass_fractions = np.asarray(mass_fractions, dtype=float)
+        if mass_fractions.shape != (len(labels), len(species)):
+            raise ValueError(
+                "The mass fractions must have one row for each zone label "
+                "and one column for each species."
+            )
+
+        properties = properties or {}
+        for prop, value in properties.items():
+            if len(value) != len(labels):
+                raise ValueError(
+                    f"Property {prop!r} must have one value for each zone."
+                )
+        properties = {
+            prop: np.asarray(value, dtype=object).reshape(len(labels))
+            for prop, value in properties.items()
+        }
+
+        columns = [
+            self.nuc_dict[sp[0] if isinstance(sp, tuple) else sp]
+            for sp in species
+        ]
+        if columns == list(range(len(self.nucs))):
+            my_data = mass_fractions
+        else:
+            my_data = np.zeros((len(labels), len(self.nucs)), dtype=float)
+            my_data[:, columns] = mass_fractions
+
+        _g = self._create_group(group)
+
+        self._add_zone_labels_to_group(_g, labels)
+        if self._property_layout == "columnar":
+            self._add_zone_property_columns_to_group(
+                _g, len(labels), properties
+            )
+        else:
+            self._add_zone_property_arrays_to_group(
+                _g, len(labels), properties
+            )
+        self._create_dataset(_g, "Mass Fractions", my_data)
+        self._add_group_to_index(
+            group,
+            labels,
+            lambda i: {key: value[i] for key, value in properties.items()},
+        )
 
     def add_group(self, group, zones):
         """Method to add a group to an hdf5 file.
@@ -1114,8 +2171,21 @@ class New_H5(wnb.Base):
 
         """
 
-        _g = self.file.create_group(group)
+        _g = self._create_group(group)
 
         self._add_zone_labels_to_group(_g, zones)
-        self._add_zone_properties_to_group(_g, zones)
+        if self._property_layout == "columnar":
+            properties = {}
+            for i, zone in enumerate(zones):
+                for prop, value in zones[zone]["properties"].items():
+                    properties.setdefault(prop, [None] * len(zones))[i] = value
+            self._add_zone_property_columns_to_group(
+                _g, len(zones), properties
+            )
+        else:
+            self._add_zone_properties_to_group(_g, zones)
         self._add_zone_mass_fractions_to_group(_g, zones)
+        labels = list(zones)
+        self._add_group_to_index(
+            group, labels, lambda i: zones[labels[i]]["properties"]
+        )
@@ -0,0 +1,647 @@
+"""Module providing classes for computing with whole reaction networks."""
+
+from collections import Counter
+from math import factorial
+import numpy as np
+from scipy.sparse import csr_matrix
+import wnutils.base as wb
+
+_NON_SMOKER_COEFFICIENTS = ("a1", "a2", "a3", "a4", "a5", "a6", "a7")
+
+# Electron rest mass energy (MeV) and Boltzmann's constant (MeV per T9).
+_ELECTRON_MASS = 0.51099895
+_BOLTZMANN = 0.08617333262
+# (m_u k_B 10^9 K / (2 pi hbar^2))^(3/2) / N_A in cm^3/g.
+_SAHA_FACTOR = 9.868459948741e9
+
+
+class Rate_Engine(wb.Base):
+    """A class for computing the rates of all reactions in a network at once.
+
+    The non-smoker fit and single rate data are packed into arrays when the
+    instance is created, so the rates of those reactions at all requested
+    temperatures are computed without a Python loop over the reactions.
+    Rates of other types are computed with
+    :meth:`wnutils.xml.Reaction.compute_rate`.
+
+    Args:
+        ``reactions`` (:obj:`dict`): A dictionary of
+        :class:`wnutils.xml.Reaction` keyed by reaction string, such as that
+        returned by :meth:`wnutils.xml.Xml.get_reaction_data`.
+
+    """
+
+    def __init__(self, reactions):
+        self._names = list(reactions)
+        self._reactions = list(reactions.values())
+
+        single_rows = []
+        single_rates = []
+        fit_rows = []
+        fit_starts = []
+        fits = []
+        self._other_rows = []
+
+        for i, reaction in enumerate(self._reactions):
+            data = reaction.data
+            if data["type"] == "single_rate":
+                single_rows.append(i)
+                single_rates.append(data["rate"])
+            elif data["type"] == "non_smoker_fit":
+                fit_rows.append(i)
+                fit_starts.append(len(fits))
+                for fit in data.get("fits") or [data]:
+                    fits.append(
+                        [fit[key] for key in _NON_SMOKER_COEFFICIENTS]
+                        + [fit["Tlowfit"], fit["Thighfit"]]
+                    )
+            else:
+                self._other_rows.append(i)
+
+        self._single_rows = np.array(single_rows, dtype=np.intp)
+        self._single_rates = np.array(single_rates, dtype=np.float64)
+        self._fit_rows = np.array(fit_rows, dtype=np.intp)
+        self._fit_starts = np.array(fit_starts, dtype=np.intp)
+
+        fits = np.array(fits, dtype=np.float64).reshape(-1, 9)
+        self._fit_coefficients = fits[:, :7]
+        self._fit_t9_low = fits[:, 7:8]
+        self._fit_t9_high = fits[:, 8:9]
+
+    def get_reactions(self):
+        """Method to retrieve the reactions in the order of the rate rows.
+
+        Returns:
+            :obj:`list`: A list of the reaction strings.  The i-th string
+            gives the reaction whose rates are in the i-th row of the array
+            returned by :meth:`compute_rates`.
+
+        """
+
+        return list(self._names)
+
+    def _compute_non_smoker_fit_rates(self, t_9):
+        t_9 = np.clip(t_9, self._fit_t9_low, self._fit_t9_high)
+        t_13 = np.cbrt(t_9)
+        a = self._fit_coefficients.T[:, :, np.newaxis]
+
+        x_fit = (
+            a[0]
+            + a[1] / t_9
+            + a[2] / t_13
+            + a[3] * t_13
+            + a[4] * t_9
+            + a[5] * t_9 * t_13 * t_13
+            + a[6] * np.log(t_9)
+        )
+
+        return np.add.reduceat(np.exp(x_fit), self._fit_starts, axis=0)
+
+    def compute_rates(self, t9, user_funcs=None):
+        """Method to compute the rates of all reactions at input t9.
+
+        Args:
+            ``t9`` (:obj:`float` or :obj:`numpy.array`): The temperatures in
+            billions of K at which to compute the rates.
+
+            ``user_funcs`` (:obj:`dict`, optional):  A dictionary of
+            user-defined functions associated with a user_rate key.
+
+        Returns:
+            :obj:`numpy.array`: A two-dimensional array in which the first
+            index gives the reaction, in the order returned by
+            :meth:`get_reactions`, and the second gives the temperature.  If
+            ``t9`` is a scalar, a one-dimensional array of the rates of the
+            reactions.
+
+        """
+
+        t_9 = np.asarray(t9, dtype=np.float64)
+        temperatures = t_9.reshape(-1)
+
+        result = np.empty((len(self._reactions), len(temperatures)))
+
+        result[self._single_rows] = self._single_rates[:, np.newaxis]
+
+        if len(self._fit_rows) > 0:
+            result[self._fit_rows] = self._compute_non_smoker_fit_rates(
+                temperatures
+            )
+
+        if t_9.ndim == 0:
+            temperatures = float(t_9)
+
+        for i in self._other_rows:
+            result[i] = self._reactions[i].compute_rate(
+                temperatures, user_funcs
+            )
+
+        if t_9.ndim == 0:
+            return result[:, 0]
+
+        return result
+
+
+class Reaction_Index(wb.Base):
+    """A class for selecting reactions from a network in memory.
+
+    The reactions are indexed once by reactant, product, rate type, and
+    source when the instance is created, so selections do not search the
+    XML.
+
+    Args:
+        ``reactions`` (:obj:`dict`): A dictionary of
+        :class:`wnutils.xml.Reaction` keyed by reaction string, such as that
+        returned by :meth:`wnutils.xml.Xml.get_reaction_data`.
+
+    """
+
+    def __init__(self, reactions):
+        self._reactions = dict(reactions)
+        self._positions = {key: i for i, key in enumerate(self._reactions)}
+        self._index = {
+            "reactant": {},
+            "product": {},
+            "rate type": {},
+            "source": {},
+        }
+
+        for key, reaction in self._reactions.items():
+            for reactant in reaction.reactants:
+                self._index["reactant"].setdefault(reactant, set()).add(key)
+            for product in reaction.products:
+                self._index["product"].setdefault(product, set()).add(key)
+            self._index["rate type"].setdefault(
+                reaction.data.get("type"), set()
+            ).add(key)
+            self._index["source"].setdefault(reaction.source, set()).add(key)
+
+    def _get_matches(self, field, values):
+        if isinstance(values, str):
+            values = [values]
+
+        matches = [self._index[field].get(value, set()) for value in values]
+
+        return set.intersection(*matches) if matches else set(self._reactions)
+
+    def get_reactions(
+        self,
+        reactants=None,
+        products=None,
+        nuclide=None,
+        rate_type=None,
+        source=None,
+    ):
+        """Method to select reactions.
+
+        Args:
+            ``reactants`` (:obj:`str` or :obj:`list`, optional): A string or
+            list of strings giving species that must all be reactants.
+            Defaults to no selection on reactants.
+
+            ``products`` (:obj:`str` or :obj:`list`, optional): A string or
+            list of strings giving species that must all be products.
+            Defaults to no selection on products.
+
+            ``nuclide`` (:obj:`str`, optional): A string giving a species
+            that must be either a reactant or a product.  Defaults to no
+            selection on the species.
+
+            ``rate_type`` (:obj:`str`, optional): A string giving the rate
+            data type, such as `non_smoker_fit` or `rate_table`.  Defaults to
+            all types.
+
+            ``source`` (:obj:`str`, optional): A string giving the source of
+            the rate data.  Defaults to all sources.
+
+        Returns:
+            :obj:`dict`: A dictionary of :class:`wnutils.xml.Reaction` keyed
+            by reaction string containing the reactions that satisfy all the
+            selections, in the order of the input reactions.
+
+        """
+
+        selections = []
+        if reactants is not None:
+            selections.append(self._get_matches("reactant", reactants))
+        if products is not None:
+            selections.append(self._get_matches("product", products))
+        if nuclide is not None:
+            selections.append(
+                self._get_matches("reactant", nuclide)
+                | self._get_matches("product", nuclide)
+            )
+        if rate_type is not None:
+            selections.append(self._get_matches("rate type", rate_type))
+        if source is not None:
+            selections.append(self._get_matches("source", source))
+
+        if not selections:
+            return dict(self._reactions)
+
+        keys = set.intersection(*selections)
+
+        return {
+            key: self._reactions[key]
+            for key in sorted(keys, key=self._positions.__getitem__)
+        }
+
+
+class Network(wb.Base):
+    """A class for computing the reaction flows in a network.
+
+    Sparse reactant and product stoichiometry matrices are built once when
+    the instance is created.  Only nuclide reactants and products enter the
+    matrices and the flows.
+
+    Args:
+        ``nuclides`` (:obj:`dict`): A dictionary of nuclide data keyed by
+        nuclide name, such as that returned by
+        :meth:`wnutils.xml.Xml.get_nuclide_data`.  The order of the keys sets
+        the order of the species.
+
+        ``reactions`` (:obj:`dict`): A dictionary of
+        :class:`wnutils.xml.Reaction` keyed by reaction string, such as that
+        returned by :meth:`wnutils.xml.Xml.get_reaction_data`.  Every nuclide
+        reactant and product must be in ``nuclides``.
+
+    """
+
+    def __init__(self, nuclides, reactions):
+        self._nuclides = dict(nuclides)
+        self._reactions = dict(reactions)
+        self._rate_engine = Rate_Engine(self._reactions)
+
+        species = {name: i for i, name in enumerate(self._nuclides)}
+        self._stoichiometry = {
+            side: self._get_stoichiometry(species, side)
+            for side in ("nuclide_reactants", "nuclide_products")
+        }
+        self._partition_functions = None
+
+        self._nuclide_arrays = {
+            field: np.array(
+                [nuclide[field] for nuclide in self._nuclides.values()],
+                dtype=np.float64,
+            )
+            for field in ("z", "a", "mass excess")
+        }
+
+        positrons = []
+        leptons = []
+        for reaction in self._reactions.values():
+            positrons.append(
+                reaction.reactants.count("positron")
+                - reaction.products.count("positron")
+            )
+            leptons.append(
+                any(
+                    element != "gamma"
+                    and self.is_non_nuclide_reaction_element_string(element)
+                    for element in reaction.reactants + reaction.products
+                )
+            )
+        self._positrons = np.array(positrons, dtype=np.float64)
+
+        difference = self._get_stoichiometry_difference()
+        self._reversible = (
+            ~np.array(leptons, dtype=bool)
+            & (difference @ self._nuclide_arrays["z"] == 0)
+            & (difference @ self._nuclide_arrays["a"] == 0)
+        )
+
+    def _get_stoichiometry(self, species, side):
+        n_species = len(species)
+        rows = []
+        columns = []
+        duplicate_factors = []
+
+        for i, (key, reaction) in enumerate(self._reactions.items()):
+            for name in getattr(reaction, side):
+                if name not in species:
+                    raise KeyError(
+                        f"Species {name!r} in reaction {key!r} is not in "
+                        "the network."
+                    )
+                rows.append(i)
+                columns.append(species[name])
+            duplicate_factors.append(
+                np.prod(
+                    [
+                        factorial(count)
+                        for count in Counter(getattr(reaction, side)).values()
+                    ]
+                )
+            )
+
+        rows = np.array(rows, dtype=np.intp)
+        columns = np.array(columns, dtype=np.intp)
+        counts = np.bincount(rows, minlength=len(self._reactions))
+
+        slots = np.full(
+            (len(self._reactions), np.max(counts, initial=0)), n_species
+        )
+        starts = np.cumsum(counts) - counts
+        slots[rows, np.arange(len(rows)) - starts[rows]] = columns
+
+        return {
+            "matrix": csr_matrix(
+                (np.ones(len(rows)), (rows, columns)),
+                shape=(len(self._reactions), n_species),
+            ),
+            "slots": slots,
+            "counts": counts,
+            "duplicate factors": np.array(duplicate_factors, dtype=np.float64),
+        }
+
+    def get_species(self):
+        """Method to retrieve the species in the order of the matrix columns.
+
+        Returns:
+            :obj:`list`: A list of the nuclide names.
+
+        """
+
+        return list(self._nuclides)
+
+    def get_reactions(self):
+        """Method to retrieve the reactions in the order of the matrix rows.
+
+        Returns:
+            :obj:`list`: A list of the reaction strings.
+
+        """
+
+        return list(self._reactions)
+
+    def get_reactant_matrix(self):
+        """Method to retrieve the reactant stoichiometry matrix.
+
+        Returns:
+            :obj:`scipy.sparse.csr_matrix`: A matrix in which the first index
+            gives the reaction and the second the species.  The value is the
+            number of times the species appears as a reactant.
+
+        """
+
+        return self._stoichiometry["nuclide_reactants"]["matrix"].copy()
+
+    def get_product_matrix(self):
+        """Method to retrieve the product stoichiometry matrix.
+
+        Returns:
+            :obj:`scipy.sparse.csr_matrix`: A matrix in which the first index
+            gives the reaction and the second the species.  The value is the
+            number of times the species appears as a product.
+
+        """
+
+        return self._stoichiometry["nuclide_products"]["matrix"].copy()
+
+    def _get_stoichiometry_difference(self):
+        return (
+            self._stoichiometry["nuclide_reactants"]["matrix"]
+            - self._stoichiometry["nuclide_products"]["matrix"]
+        )
+
+    def compute_q_values(self):
+        """Method to compute the Q-values of the reactions.
+
+        Returns:
+            :obj:`numpy.array`: The Q-values in MeV of the reactions, in the
+            order returned by :meth:`get_reactions`.  Each Q-value is the
+            sum of the reactant mass excesses less the sum of the product
+            mass excesses, corrected for positrons, since the mass excesses
+            are atomic.
+
+        """
+
+        return (
+            self._get_stoichiometry_difference()
+            @ self._nuclide_arrays["mass excess"]
+            + 2.0 * _ELECTRON_MASS * self._positrons
+        )
+
+    def compute_reverse_ratios(self, t9):
+        """Method to compute the ratios of the reverse to forward rates.
+
+        The ratios follow from detailed balance with the nuclide partition
+        functions.  Reactions with leptons or that do not conserve nuclear
+        charge and mass number have ratio zero.
+
+        Args:
+            ``t9`` (:obj:`float` or :obj:`numpy.array`): The temperatures in
+            billions of K at which to compute the ratios.
+
+        Returns:
+            :obj:`numpy.array`: A two-dimensional array in which the first
+            index gives the temperature and the second the reaction, in the
+            order returned by :meth:`get_reactions`, suitable as the
+            ``reverse_ratios`` of :meth:`compute_flows`.  If ``t9`` is a
+            scalar, a one-dimensional array of the ratios of the reactions.
+
+        """
+
+        if self._partition_functions is None:
+            self._partition_functions = Partition_Functions(self._nuclides)
+
+        t_9 = np.asarray(t9, dtype=np.float64)
+        temperatures = t_9.reshape(-1)
+
+        reactants = self._stoichiometry["nuclide_reactants"]
+        products = self._stoichiometry["nuclide_products"]
+
+        log_ratios = self._get_stoichiometry_difference() @ (
+            np.log(
+                self._partition_functions.compute_partition_functions(
+                    temperatures
+                )
+            )
+            + 1.5 * np.log(self._nuclide_arrays["a"])[:, np.newaxis]
+        )
+        log_ratios += np.outer(
+            reactants["counts"] - products["counts"],
+            np.log(_SAHA_FACTOR * np.power(temperatures, 1.5)),
+        )
+        log_ratios += np.log(
+            products["duplicate factors"] / reactants["duplicate factors"]
+        )[:, np.newaxis]
+        log_ratios -= np.outer(
+            self.compute_q_values(), 1.0 / (_BOLTZMANN * temperatures)
+        )
+
+        log_ratios[~self._reversible] = -np.inf
+        result = np.exp(log_ratios).T
+
+        if t_9.ndim == 0:
+            return result[0]
+
+        return result
+
+    def _compute_side_flows(self, side, rates, abundances, rho):
+        stoichiometry = self._stoichiometry[side]
+
+        padded = np.hstack((abundances, np.ones((len(abundances), 1))))
+        flows = rates * np.power(
+            rho[:, np.newaxis], stoichiometry["counts"] - 1.0
+        )
+        for slot in stoichiometry["slots"].T:
+            flows *= padded[:, slot]
+
+        return flows / stoichiometry["duplicate factors"]
+
+    def compute_flows(
+        self, abundances, t9, rho, user_funcs=None, reverse_ratios=None
+    ):
+        """Method to compute the reaction flows in zones.
+
+        Args:
+            ``abundances`` (:obj:`numpy.array`): A two-dimensional array in
+            which the first index gives the zone and the second the species,
+            in the order returned by :meth:`get_species`.
+
+            ``t9`` (:obj:`float` or :obj:`numpy.array`): The temperature in
+            billions of K in each zone.
+
+            ``rho`` (:obj:`float` or :obj:`numpy.array`): The mass density in
+            g/cc in each zone.
+
+            ``user_funcs`` (:obj:`dict`, optional):  A dictionary of
+            user-defined functions associated with a user_rate key.  Each
+            function is called with an array of the zone temperatures.
+
+            ``reverse_ratios`` (:obj:`numpy.array`, optional): A
+            two-dimensional array in which the first index gives the zone and
+            the second the reaction and whose value is the ratio of the
+            reverse rate to the forward rate, such as that returned by
+            :meth:`compute_reverse_ratios`.  Defaults to no reverse flows.
+
+        Returns:
+            :obj:`dict`: A dictionary of two-dimensional :obj:`numpy.array`
+            with keys `forward`, `reverse`, and `net`.  In each array, the
+            first index gives the zone and the second the reaction, in the
+            order returned by :meth:`get_reactions`.
+
+        """
+
+        abundances = np.atleast_2d(np.asarray(abundances, dtype=np.float64))
+        if abundances.shape[1] != len(self._nuclides):
+            raise ValueError(
+                "The abundances must have one column for each species."
+            )
+
+        n_zones = len(abundances)
+        t9 = np.broadcast_to(np.asarray(t9, dtype=np.float64), (n_zones,))
+        rho = np.broadcast_to(np.asarray(rho, dtype=np.float64), (n_zones,))
+
+        rates = self._rate_engine.compute_rates(t9, user_funcs).T
+
+        forward = self._compute_side_flows(
+            "nuclide_reactants", rates, abundances, rho
+        )
+
+        if reverse_ratios is None:
+            reverse = np.zeros_like(forward)
+        else:
+            reverse = self._compute_side_flows(
+                "nuclide_products", rates * reverse_ratios, abundances, rho
+            )
+
+        return {
+            "forward": forward,
+            "reverse": reverse,
+            "net": forward - reverse,
+        }
+
+
+class Partition_Functions(wb.Base):
+    """A class for computing the partition functions of many nuclides.
+
+    The partition function tables of all nuclides are packed onto the union
+    of their temperature grids when the instance is created.  Between table
+    points, the logarithm of the partition function is interpolated linearly
+    in temperature.  Outside its table, a nuclide's partition function is
+    that at the nearest table point.  A nuclide without a table has
+    partition function 2J + 1, where J is the spin.
+
+    Args:
+        ``nuclides`` (:obj:`dict`): A dictionary of nuclide data keyed by
+        nuclide name, such as that returned by
+        :meth:`wnutils.xml.Xml.get_nuclide_data`.
+
+    """
+
+    def __init__(self, nuclides):
+        self._species = list(nuclides)
+
+        grid = np.unique(
+            np.concatenate(
+                [np.zeros(0)]
+                + [nuclide["t9"] for nuclide in nuclides.values()]
+            )
+        )
+        if len(grid) == 0:
+            grid = np.zeros(1)
+
+        self._t9 = grid
+        self._log10_partf = np.empty((len(self._species), len(grid)))
+
+        for i, nuclide in enumerate(nuclides.values()):
+            if len(nuclide["t9"]) > 0:
+                self._log10_partf[i] = np.interp(
+                    grid, nuclide["t9"], np.log10(nuclide["partf"])
+                )
+            else:
+                self._log10_partf[i] = np.log10(2.0 * nuclide["spin"] + 1.0)
+
+    def get_species(self):
+        """Method to retrieve the species in the order of the result rows.
+
+        Returns:
+            :obj:`list`: A list of the nuclide names.
+
+        """
+
+        return list(self._species)
+
+    def compute_partition_functions(self, t9):
+        """Method to compute the partition functions of all nuclides.
+
+        Args:
+            ``t9`` (:obj:`float` or :obj:`numpy.array`): The temperatures in
+            billions of K at which to compute the partition functions.
+
+        Returns:
+            :obj:`numpy.array`: A two-dimensional array in which the first
+            index gives the species, in the order returned by
+            :meth:`get_species`, and the second gives the temperature.  If
+            ``t9`` is a scalar, a one-dimensional array of the partition
+            functions of the species.
+
+        """
+
+        t_9 = np.asarray(t9, dtype=np.float64)
+        temperatures = np.clip(t_9.reshape(-1), self._t9[0], self._t9[-1])
+
+        if len(self._t9) == 1:
+            lower = upper = np.zeros(len(temperatures), dtype=np.intp)
+            weight = np.zeros(len(temperatures))
+        else:
+            upper = np.clip(
+                np.searchsorted(self._t9, temperatures), 1, len(self._t9) - 1
+            )
+            lower = upper - 1
+            weight = (temperatures - self._t9[lower]) / (
+                self._t9[upper] - self._t9[lower]
+            )
+
+        result = np.power(
+            10.0,
+            self._log10_partf[:, lower] * (1.0 - weight)
+            + self._log10_partf[:, upper] * weight,
+        )
+
+        if t_9.ndim == 0:
+            return result[:, 0]
+
+        return result
@@ -1,8 +1,17 @@
 """Module providing xml classes."""
 
+from collections import OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+import hashlib
+import mmap
 from numbers import Real
+import os
 from pathlib import Path
+import re
 from urllib.parse import urlparse
+import warnings
+import zipfile
 from lxml import etree
 import matplotlib as mpl
 import matplotlib.pyplot as plt
@@ -10,7 +19,8 @@ from matplotlib import cm
 from matplotlib.colors import LogNorm
 from matplotlib import animation
 import numpy as np
-from scipy.interpolate import interp1d
+from scipy.interpolate import make_interp_spline
+from scipy.sparse import csr_matrix
 import wnutils.base as wb
 
 _SCHEMA_DIRECTORY = Path(__file__).parent / "xsd_pub"
@@ -84,33 +94,48 @@ class Reaction(wb.Base):
         self.nuclide_products = []
         self.source = ""
         self.data = {}
+        self._rate_table_splines = None
 
-    def _compute_rate_table_rate_interpolation(self, t_9):
+    def _get_rate_table_splines(self):
+        arrays = (self.data["t9"], self.data["rate"], self.data["sef"])
+        cached = self._rate_table_splines
+
+        if cached is None or any(
+            old is not new for old, new in zip(cached[0], arrays)
+        ):
+            _t, rate, sef = arrays
+            k = 1 if len(_t) <= 3 else 3
+            cached = (
+                arrays,
+                make_interp_spline(_t, np.log10(rate), k=k),
+                make_interp_spline(_t, sef, k=k),
+            )
+            self._rate_table_splines = cached
+
+        return cached[1], cached[2]
+
+    def _compute_rate_table_rate(self, t_9):
         _t = self.data["t9"]
-        _lr = np.log10(self.data["rate"])
-        sef = self.data["sef"]
+        f_rate, f_sef = self._get_rate_table_splines()
 
-        if t_9 < _t[0]:
-            return np.power(10.0, _lr[0]) * sef[0]
-        if t_9 > _t[len(_t) - 1]:
-            return np.power(10.0, _lr[len(_t) - 1]) * sef[len(_t) - 1]
+        t_9_array = np.asarray(t_9, dtype=np.float64)
+        clamped = np.clip(t_9_array, _t[0], _t[-1])
 
-        if len(_t) <= 3:
-            _f1 = interp1d(_t, _lr, kind="linear")
-            _f2 = interp1d(_t, sef, kind="linear")
-            return np.power(10.0, _f1(t_9)) * _f2(t_9)
+        result = np.power(10.0, f_rate(clamped)) * f_sef(clamped)
 
-        _f1 = interp1d(_t, _lr, kind="cubic")
-        _f2 = interp1d(_t, sef, kind="cubic")
-        return np.power(10.0, _f1(t_9)) * _f2(t_9)
+        low = t_9_array < _t[0]
+        high = t_9_array > _t[-1]
+        result = np.where(
+            low, self.data["rate"][0] * self.data["sef"][0], result
+        )
+        result = np.where(
+            high, self.data["rate"][-1] * self.data["sef"][-1], result
+        )
 
-    def _compute_rate_table_rate(self, t_9):
         if isinstance(t_9, Real):
-            return self._compute_rate_table_rate_interpolation(t_9)
+            return float(result)
 
-        return np.array(
-            [self._compute_rate_table_rate_interpolation(x) for x in t_9]
-        )
+        return result
 
     def _compute_non_smoker_fit_rate_for_fit(self, fit, t_9):
         def non_smoker_function(fit, t_9):
@@ -235,7 +260,350 @@ class Reaction(wb.Base):
         return _s
 
 
-class Xml(wb.Base):
+_XPATH_RESULT_CACHE_SIZE = 64
+
+
+@lru_cache(maxsize=256)
+def _compile_xpath(path):
+    return etree.XPath(path)
+
+
+_ZONE_NUCLIDE_COUNT = etree.XPath("count(mass_fractions/nuclide)")
+_ZONE_NUCLIDE_NAMES = etree.XPath(
+    "mass_fractions/nuclide/@name", smart_strings=False
+)
+_ZONE_NUCLIDE_Z = etree.XPath(
+    "mass_fractions/nuclide/z/text()", smart_strings=False
+)
+_ZONE_NUCLIDE_A = etree.XPath(
+    "mass_fractions/nuclide/a/text()", smart_strings=False
+)
+_ZONE_NUCLIDE_X = etree.XPath(
+    "mass_fractions/nuclide/x/text()", smart_strings=False
+)
+
+
+_SIDECAR_SUFFIX = ".wnutils.npz"
+_SIDECAR_VERSION = 2
+_PROPERTY_COLUMNS = (
+    "property zone",
+    "property name",
+    "property tag1",
+    "property tag2",
+    "property tags",
+    "property value",
+    "property empty",
+)
+_SIDECAR_ZONE_ARRAYS = ("z", "a") + _PROPERTY_COLUMNS
+_SIDECAR_NUCLIDE_FIELDS = ("z", "a", "state", "source", "mass excess", "spin")
+
+
+def _encode_labels(labels):
+    columns = [[], [], []]
+    counts = []
+    for label in labels:
+        if isinstance(label, str):
+            label = (label,)
+        counts.append(len(label))
+        for i, column in enumerate(columns):
+            column.append(label[i] if i < len(label) else "")
+
+    result = {"label count": np.array(counts, dtype=np.int8)}
+    for i, column in enumerate(columns):
+        result[f"label{i + 1}"] = np.array(column, dtype=np.str_)
+
+    return result
+
+
+def _decode_labels(arrays):
+    labels = []
+    for count, *label in zip(
+        arrays["label count"].tolist(),
+        arrays["label1"].tolist(),
+        arrays["label2"].tolist(),
+        arrays["label3"].tolist(),
+    ):
+        labels.append(label[0] if count == 1 else tuple(label[:count]))
+
+    return labels
+
+
+def _encode_nuclides(nuclides):
+    result = {}
+    for field in _SIDECAR_NUCLIDE_FIELDS:
+        result["nuclide " + field] = np.array(
+            [nuclide[field] for nuclide in nuclides]
+        )
+    result["nuclide partf offsets"] = np.cumsum(
+        [0] + [len(nuclide["t9"]) for nuclide in nuclides]
+    )
+    for field in ("t9", "partf"):
+        result["nuclide " + field] = np.concatenate(
+            [np.zeros(0)] + [nuclide[field] for nuclide in nuclides]
+        )
+
+    return result
+
+
+def _decode_nuclides(arrays):
+    fields = {
+        field: arrays["nuclide " + field].tolist()
+        for field in _SIDECAR_NUCLIDE_FIELDS
+    }
+    offsets = arrays["nuclide partf offsets"]
+
+    result = []
+    for i in range(len(offsets) - 1):
+        nuclide = {"z": fields["z"][i], "a": fields["a"][i]}
+        nuclide["n"] = nuclide["a"] - nuclide["z"]
+        for field, values in fields.items():
+            nuclide[field] = values[i]
+        for field in ("t9", "partf"):
+            nuclide[field] = arrays["nuclide " + field][
+                offsets[i] : offsets[i + 1]
+            ].copy()
+        result.append(nuclide)
+
+    return result
+
+
+class _Zone_Reader(wb.Base):
+    """A base class for extracting data from webnucleo xml zones."""
+
+    def _get_zone_label(self, zone):
+        label = "0"
+        label_1 = zone.get("label1")
+        if label_1 is not None:
+            label = label_1
+        label_2 = zone.get("label2")
+        if label_2 is not None:
+            label = (label, label_2)
+        label_3 = zone.get("label3")
+        if label_3 is not None:
+            label = (label[0], label[1], label_3)
+        return label
+
+    def _get_all_zone_properties(self, zone):
+        result = {}
+
+        props = zone.findall("optional_properties/property")
+
+        for prop in props:
+            name = prop.get("name")
+            tag1 = prop.get("tag1")
+            tag2 = prop.get("tag2")
+            if tag1 is not None:
+                p_name = (name, tag1)
+                if tag2 is not None:
+                    p_name += (tag2,)
+            else:
+                p_name = name
+            result[p_name] = prop.text
+
+        return result
+
+    def _get_nuclide_data_for_zone(self, zone):
+        result = {}
+
+        species = zone.findall("mass_fractions/nuclide")
+
+        for s_sp in species:
+            _z = int(s_sp.findtext("z"))
+            _a = int(s_sp.findtext("a"))
+            name = s_sp.get("name")
+            if name is None:
+                name = self.create_nuclide_name(_z, _a, "")
+            result[(name, _z, _a)] = float(s_sp.findtext("x"))
+
+        return result
+
+    def _get_zone_data(self, zone):
+        return {
+            "properties": self._get_all_zone_properties(zone),
+            "mass fractions": self._get_nuclide_data_for_zone(zone),
+        }
+
+    def _get_zone_records(self, zones):
+        labels = []
+        zone_index = []
+        names = []
+        z_values = []
+        a_values = []
+        x_values = []
+        properties = []
+
+        for i, zone in enumerate(zones):
+            for prop in zone.iterfind("optional_properties/property"):
+                tag1 = prop.get("tag1")
+                tag2 = prop.get("tag2")
+                if tag1 is None:
+                    tags = 0
+                elif tag2 is None:
+                    tags = 1
+                else:
+                    tags = 2
+                properties.append(
+                    (
+                        i,
+                        prop.get("name", ""),
+                        tag1 or "",
+                        tag2 or "",
+                        tags,
+                        prop.text or "",
+                        prop.text is None,
+                    )
+                )
+
+            count = int(_ZONE_NUCLIDE_COUNT(zone))
+            z_text = _ZONE_NUCLIDE_Z(zone)
+            a_text = _ZONE_NUCLIDE_A(zone)
+            x_text = _ZONE_NUCLIDE_X(zone)
+            if not len(z_text) == len(a_text) == len(x_text) == count:
+                raise ValueError(
+                    "Zone mass fraction entries must each contain z, a, and x."
+                )
+            zone_names = _ZONE_NUCLIDE_NAMES(zone)
+            if len(zone_names) != count:
+                zone_names = [
+                    nuclide.get("name", "")
+                    for nuclide in zone.iterfind("mass_fractions/nuclide")
+                ]
+            labels.append(self._get_zone_label(zone))
+            zone_index.extend([i] * count)
+            names.extend(zone_names)
+            z_values.extend(z_text)
+            a_values.extend(a_text)
+            x_values.extend(x_text)
+
+        columns = list(zip(*properties)) or [()] * 7
+
+        return {
+            "labels": labels,
+            "zone": np.array(zone_index, dtype=np.intp),
+            "name": names,
+            "z": np.array(z_values, dtype=np.int_),
+            "a": np.array(a_values, dtype=np.int_),
+            "x": np.array(x_values, dtype=np.float64),
+            "property zone": np.array(columns[0], dtype=np.intp),
+            "property name": np.array(columns[1], dtype=np.str_),
+            "property tag1": np.array(columns[2], dtype=np.str_),
+            "property tag2": np.array(columns[3], dtype=np.str_),
+            "property tags": np.array(columns[4], dtype=np.int8),
+            "property value": np.array(columns[5], dtype=np.str_),
+            "property empty": np.array(columns[6], dtype=bool),
+        }
+
+
+def _iter_zone_elements(file):
+    context = etree.iterparse(
+        file,
+        events=("end",),
+        tag=("zone", "nuclear_network"),
+        remove_blank_text=True,
+    )
+
+    for _event, element in context:
+        if element.tag == "zone":
+            yield element
+        element.clear(keep_tail=True)
+        while element.getprevious() is not None:
+            del element.getparent()[0]
+
+
+_ZONE_START = re.compile(rb"<zone[\s/>]")
+
+
+def _uses_xinclude(data):
+    return data.find(b"http://www.w3.org/2001/XInclude") >= 0
+
+
+# Markup that a byte-level split on zone start tags cannot handle: zone
+# tags inside comments, CDATA sections, or processing instructions, and
+# entities declared in a document type declaration that the parts lack.
+_UNSPLITTABLE_MARKUP = (b"<!--", b"<![CDATA[", b"<?")
+
+
+def _split_zone_data(file, n_parts):
+    try:
+        with (
+            open(file, "rb") as stream,
+            mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as data,
+        ):
+            if _uses_xinclude(data):
+                return None
+            begin = data.find(b"<zone_data")
+            end = data.rfind(b"</zone_data>")
+            if begin < 0 or end < begin:
+                return None
+            if data.find(b"<!DOCTYPE", 0, begin) >= 0 or any(
+                data.find(markup, begin, end) >= 0
+                for markup in _UNSPLITTABLE_MARKUP
+            ):
+                return None
+            prolog = b""
+            if data[:5] == b"<?xml":
+                prolog = data[: data.find(b"?>") + 2]
+            starts = np.array(
+                [
+                    match.start()
+                    for match in _ZONE_START.finditer(data, begin, end)
+                ],
+                dtype=np.int64,
+            )
+    except (OSError, ValueError):
+        return None
+
+    if len(starts) == 0:
+        return None
+
+    targets = np.linspace(starts[0], end, n_parts + 1)[1:-1]
+    bounds = np.unique(
+        np.concatenate(([0], np.searchsorted(starts, targets), [len(starts)]))
+    )
+    offsets = np.append(starts, end)
+
+    return [
+        (file, prolog, int(offsets[i]), int(offsets[j]))
+        for i, j in zip(bounds[:-1], bounds[1:])
+    ]
+
+
+def _read_zone_part(part):
+    file, prolog, start, stop = part
+
+    with open(file, "rb") as stream:
+        stream.seek(start)
+        data = stream.read(stop - start)
+
+    root = etree.fromstring(
+        prolog + b"<zone_data>" + data + b"</zone_data>",
+        etree.XMLParser(remove_blank_text=True),
+    )
+
+    return _Zone_Reader()._get_zone_records(root.iterchildren("zone"))
+
+
+def _merge_zone_records(parts):
+    result = {}
+    offset = 0
+
+    for part in parts:
+        for key, value in part.items():
+            if key in ("zone", "property zone"):
+                value = value + offset
+            result.setdefault(key, []).append(value)
+        offset += len(part["labels"])
+
+    for key, values in result.items():
+        if isinstance(values[0], list):
+            result[key] = [item for value in values for item in value]
+        else:
+            result[key] = np.concatenate(values)
+
+    return result
+
+
+class Xml(_Zone_Reader):
     """A class for reading and plotting webnucleo xml files.
 
     Each instance corresponds to an xml file.  Methods extract
@@ -244,13 +612,186 @@ class Xml(wb.Base):
     Args:
         ``file`` (:obj:`str`): The name of the xml file.
 
+        ``cache`` (:obj:`bool`, optional): If set to True, the zone data,
+        nuclear data, and network limits extracted from the file are stored
+        in a binary sidecar file next to it (the name of the xml file with
+        `.wnutils.npz` appended).  A later instance created with this option
+        loads the sidecar instead of parsing the xml, and rebuilds it if
+        the xml file has changed.  Queries not covered by the sidecar parse
+        the xml on first use.  Ignored unless ``file`` is a local path to a
+        document without XInclude directives.  Defaults to False.
+
+        ``workers`` (:obj:`int`, optional): The number of worker processes
+        among which the zones are split when the zone data are extracted.
+        Each worker parses a contiguous range of zones, and the results are
+        merged in zone order, so the whole document is only parsed in this
+        process for queries that need the tree.  Only used for local paths
+        to files without XInclude directives, document type declarations,
+        and comments, CDATA sections, or processing instructions among the
+        zones; otherwise the zones are extracted serially.  Defaults to
+        serial extraction.
+
     """
 
-    def __init__(self, file):
+    def __init__(self, file, cache=False, workers=None):
+        if workers is not None and workers < 1:
+            raise ValueError("workers must be a positive integer.")
+
+        self._file = file
+        self._workers = workers or 1
+        self._xml = None
+        self._root_element = None
+        self._xpath_results = OrderedDict()
+        self._zone_table = None
+        self._zone_rows = {}
+        self._sidecar = None
+
+        if cache and self._get_file_key() is not None:
+            if not self._load_sidecar():
+                self._write_sidecar()
+        elif self._workers < 2 or not isinstance(file, (str, os.PathLike)):
+            self._parse()
+
+    def _parse(self):
         parser = etree.XMLParser(remove_blank_text=True)
-        self._xml = etree.parse(file, parser)
+        self._xml = etree.parse(self._file, parser)
         self._xml.xinclude()
-        self._root = self._xml.getroot()
+        self._root_element = self._xml.getroot()
+
+    @property
+    def _root(self):
+        if self._root_element is None:
+            self._parse()
+        return self._root_element
+
+    def _get_sidecar_path(self):
+        path = Path(self._file)
+        return path.with_name(path.name + _SIDECAR_SUFFIX)
+
+    def _get_file_key(self):
+        try:
+            path = Path(self._file).resolve()
+            stat = path.stat()
+        except (OSError, TypeError, ValueError):
+            return None
+
+        return {
+            "version": _SIDECAR_VERSION,
+            "path": str(path),
+            "size": stat.st_size,
+            "mtime": stat.st_mtime_ns,
+        }
+
+    def _get_file_hash(self):
+        digest = hashlib.sha256()
+        with open(self._file, "rb") as file:
+            for chunk in iter(lambda: file.read(1 << 20), b""):
+                digest.update(chunk)
+
+        return digest.hexdigest()
+
+    def _load_sidecar(self):
+        try:
+            with np.load(self._get_sidecar_path(), allow_pickle=False) as data:
+                arrays = {key: data[key] for key in data.files}
+        except (OSError, ValueError, zipfile.BadZipFile):
+            return False
+
+        key = self._get_file_key()
+        if key is None:
+            return False
+
+        # The size and modification time validate the sidecar; the content
+        # hash is only computed when the file has been touched.
+        mtime = key.pop("mtime")
+        try:
+            if any(
+                arrays[name].item() != value for name, value in key.items()
+            ):
+                return False
+            if (
+                arrays["mtime"].item() != mtime
+                and arrays["hash"].item() != self._get_file_hash()
+            ):
+                return False
+        except KeyError:
+            return False
+
+        self._sidecar = arrays
+        table = {
+            "labels": _decode_labels(arrays),
+            "name": arrays["name"].tolist(),
+            "mass fractions": arrays["mass fractions"],
+            "counts": arrays["counts"],
+        }
+        for name in _SIDECAR_ZONE_ARRAYS:
+            table[name] = arrays[name]
+        self._zone_table = self._index_zone_table(table)
+
+        return True
+
+    def _write_sidecar(self):
+        key = self._get_file_key()
+        if key is None:
+            return
+
+        # The key does not cover included files, so documents with XInclude
+        # directives are not cached.
+        try:
+            with (
+                open(self._file, "rb") as stream,
+                mmap.mmap(stream.fileno(), 0, access=mmap.ACCESS_READ) as data,
+            ):
+                if _uses_xinclude(data):
+                    return
+        except (OSError, ValueError):
+            return
+
+        key["hash"] = self._get_file_hash()
+        table = self._get_zone_table()
+        limits = self.get_network_limits()
+        nuclides = self._get_nuclide_data_array(" ")
+
+        arrays = {
+            "type": np.array(self.get_type()),
+            "name": np.array(table["name"], dtype=np.str_),
+            "mass fractions": table["mass fractions"],
+            "counts": table["counts"],
+            "limits z": limits["z"],
+            "limits n_min": limits["n_min"],
+            "limits n_max": limits["n_max"],
+        }
+        arrays.update(_encode_labels(table["labels"]))
+        arrays.update(_encode_nuclides(nuclides))
+        for name in _SIDECAR_ZONE_ARRAYS:
+            arrays[name] = table[name]
+        for name, value in key.items():
+            arrays[name] = np.array(value)
+
+        path = self._get_sidecar_path()
+        partial = path.with_name(path.name + ".partial")
+        try:
+            with open(partial, "wb") as file:
+                np.savez(file, **arrays)
+            os.replace(partial, path)
+        except OSError as error:
+            warnings.warn(f"Could not write cache file {path}: {error}")
+            return
+
+        self._sidecar = arrays
+
+    def _from_sidecar(self, xpath):
+        return self._sidecar is not None and not xpath.strip()
+
+    def _xpath(self, path):
+        if path in self._xpath_results:
+            self._xpath_results.move_to_end(path)
+        else:
+            self._xpath_results[path] = _compile_xpath(path)(self._root)
+            if len(self._xpath_results) > _XPATH_RESULT_CACHE_SIZE:
+                self._xpath_results.popitem(last=False)
+
+        return self._xpath_results[path]
 
     def _get_state_data(self, state_data, node):
         data = {}
@@ -273,9 +814,12 @@ class Xml(wb.Base):
         state_data.update(data)
 
     def _get_nuclide_data_array(self, nuc_xpath):
+        if self._from_sidecar(nuc_xpath):
+            return _decode_nuclides(self._sidecar)
+
         result = []
 
-        nuclides = self._root.xpath("//nuclear_data/nuclide" + nuc_xpath)
+        nuclides = self._xpath("//nuclear_data/nuclide" + nuc_xpath)
 
         for nuc in nuclides:
             data = {}
@@ -305,6 +849,9 @@ class Xml(wb.Base):
 
         """
 
+        if self._root_element is None and self._sidecar is not None:
+            return self._sidecar["type"].item()
+
         return self._root.tag
 
     def get_nuclide_data(self, nuc_xpath=" "):
@@ -344,7 +891,13 @@ class Xml(wb.Base):
 
         """
 
-        nuclides = self._root.xpath("//nuclear_data/nuclide" + nuc_xpath)
+        if self._from_sidecar(nuc_xpath):
+            return {
+                name: self._sidecar["limits " + name].copy()
+                for name in ("z", "n_min", "n_max")
+            }
+
+        nuclides = self._xpath("//nuclear_data/nuclide" + nuc_xpath)
         limits = {}
 
         for nuclide in nuclides:
@@ -362,25 +915,10 @@ class Xml(wb.Base):
 
         return {"z": _z, "n_min": n_min, "n_max": n_max}
 
-    def _get_nuclide_data_for_zone(self, zone):
-        result = {}
-
-        species = zone.findall("mass_fractions/nuclide")
-
-        for s_sp in species:
-            _z = int(s_sp.findtext("z"))
-            _a = int(s_sp.findtext("a"))
-            name = s_sp.get("name")
-            if name is None:
-                name = self.create_nuclide_name(_z, _a, "")
-            result[(name, _z, _a)] = float(s_sp.findtext("x"))
-
-        return result
-
     def _get_reaction_data_array(self, reac_xpath):
         result = []
 
-        reactions = self._root.xpath("//reaction_data/reaction" + reac_xpath)
+        reactions = self._xpath("//reaction_data/reaction" + reac_xpath)
 
         for reaction_node in reactions:
             _r = Reaction()
@@ -553,7 +1091,192 @@ class Xml(wb.Base):
         return result
 
     def _get_zones(self, zone_xpath):
-        return self._root.xpath("//zone_data/zone" + zone_xpath)
+        return self._xpath("//zone_data/zone" + zone_xpath)
+
+    def _build_zone_table(self, records):
+        n_zones = len(records["labels"])
+        columns = {}
+        column_index = np.array(
+            [
+                columns.setdefault(key, len(columns))
+                for key in zip(
+                    records["name"],
+                    records["z"].tolist(),
+                    records["a"].tolist(),
+                )
+            ],
+            dtype=np.intp,
+        )
+        n_species = len(columns)
+
+        cells = records["zone"] * n_species + column_index
+        size = n_zones * n_species
+        mass_fractions = np.bincount(
+            cells, weights=records["x"], minlength=size
+        ).reshape(n_zones, n_species)
+        counts = (
+            np.minimum(np.bincount(cells, minlength=size), 2)
+            .astype(np.uint8)
+            .reshape(n_zones, n_species)
+        )
+
+        table = {
+            "labels": records["labels"],
+            "name": [key[0] for key in columns],
+            "z": np.array([key[1] for key in columns], dtype=np.int_),
+            "a": np.array([key[2] for key in columns], dtype=np.int_),
+            "mass fractions": mass_fractions,
+            "counts": counts,
+        }
+        for name in _PROPERTY_COLUMNS:
+            table[name] = records[name]
+
+        return self._index_zone_table(table)
+
+    def _index_zone_table(self, table):
+        by_name = {}
+        keys = []
+        for i, (name, _z, _a) in enumerate(
+            zip(table["name"], table["z"].tolist(), table["a"].tolist())
+        ):
+            if name:
+                by_name.setdefault(name, []).append(i)
+            else:
+                name = self.create_nuclide_name(_z, _a, "")
+            keys.append((name, _z, _a))
+        key_counts = {}
+        for key in keys:
+            key_counts[key] = key_counts.get(key, 0) + 1
+
+        table["species"] = keys
+        table["by name"] = by_name
+        table["ambiguous"] = np.array(
+            [key_counts[key] > 1 for key in keys], dtype=bool
+        )
+        table["property offsets"] = np.searchsorted(
+            table["property zone"], np.arange(len(table["labels"]) + 1)
+        )
+
+        return table
+
+    def _get_zone_records_in_parallel(self):
+        if self._workers < 2 or not isinstance(self._file, (str, os.PathLike)):
+            return None
+
+        parts = _split_zone_data(self._file, self._workers)
+        if parts is None:
+            return None
+
+        with ProcessPoolExecutor(max_workers=len(parts)) as executor:
+            return _merge_zone_records(
+                list(executor.map(_read_zone_part, parts))
+            )
+
+    def _get_zone_table(self):
+        if self._zone_table is None:
+            records = self._get_zone_records_in_parallel()
+            if records is None:
+                zones = self._get_zones("")
+                records = self._get_zone_records(zones)
+                self._zone_rows = {zone: i for i, zone in enumerate(zones)}
+            self._zone_table = self._build_zone_table(records)
+
+        return self._zone_table
+
+    def _get_zone_rows(self, zone_xpath):
+        table = self._get_zone_table()
+
+        if not zone_xpath.strip():
+            return np.arange(len(table["labels"]))
+
+        if not self._zone_rows:
+            zones = self._get_zones("")
+            if len(zones) != len(table["labels"]):
+                raise ValueError("Cached zone data do not match the xml.")
+            self._zone_rows = {zone: i for i, zone in enumerate(zones)}
+
+        return np.array(
+            [self._zone_rows[zone] for zone in self._get_zones(zone_xpath)],
+            dtype=np.intp,
+        )
+
+    def _get_zone_table_properties(self, row):
+        table = self._get_zone_table()
+        start, stop = table["property offsets"][row : row + 2]
+
+        result = {}
+        for name, tag1, tag2, tags, value, empty in zip(
+            *(
+                table[column][start:stop].tolist()
+                for column in _PROPERTY_COLUMNS[1:]
+            )
+        ):
+            if empty:
+                value = None
+            if tags == 0:
+                result[name] = value
+            elif tags == 1:
+                result[(name, tag1)] = value
+            else:
+                result[(name, tag1, tag2)] = value
+
+        return result
+
+    def _get_zone_table_mass_fractions(self, row):
+        table = self._get_zone_table()
+        columns = np.flatnonzero(table["counts"][row])
+
+        if np.any(table["counts"][row, columns] > 1) or np.any(
+            table["ambiguous"][columns]
+        ):
+            return self._get_nuclide_data_for_zone(self._get_zones("")[row])
+
+        return dict(
+            zip(
+                [table["species"][column] for column in columns],
+                table["mass fractions"][row, columns].tolist(),
+            )
+        )
+
+    def get_mass_fractions_matrix(self, zone_xpath=" "):
+        """Method to retrieve all mass fractions in zones as a matrix.
+
+        The matrix is extracted from the XML once and cached, so repeated
+        calls only slice the cached data.
+
+        Args:
+            ``zone_xpath`` (:obj:`str`, optional): XPath expression to select
+            zones.  Defaults to all zones.
+
+        Returns:
+            :obj:`dict`: A dictionary with key `labels`, a :obj:`list` of the
+            labels of the selected zones, key `species`, a :obj:`list` of
+            :obj:`tuple` giving the name, atomic number, and mass number of
+            each species present in any zone, and key `mass fractions`, a
+            two-dimensional :obj:`numpy.array` in which the first index
+            gives the zone and the second the species.
+
+        """
+
+        table = self._get_zone_table()
+        rows = self._get_zone_rows(zone_xpath)
+
+        species = {}
+        columns = [
+            species.setdefault(key, len(species)) for key in table["species"]
+        ]
+        mass_fractions = table["mass fractions"][rows]
+
+        if len(species) != len(columns):
+            merged = np.zeros((len(rows), len(species)))
+            np.add.at(merged, (slice(None), columns), mass_fractions)
+            mass_fractions = merged
+
+        return {
+            "labels": [table["labels"][row] for row in rows],
+            "species": list(species),
+            "mass fractions": mass_fractions,
+        }
 
     def get_mass_fractions(self, species, zone_xpath=" "):
         """Method to retrieve mass fractions of nuclides in specified zones.
@@ -573,22 +1296,18 @@ class Xml(wb.Base):
 
         result = {}
 
-        zones = self._get_zones(zone_xpath)
+        table = self._get_zone_table()
+        rows = self._get_zone_rows(zone_xpath)
 
         for _sp in species:
-            result[_sp] = np.zeros(len(zones))
-
-        for i, zone in enumerate(zones):
-            values = {}
-            counts = {}
-            for nuclide in zone.findall("mass_fractions/nuclide"):
-                name = nuclide.get("name")
-                if name in result:
-                    counts[name] = counts.get(name, 0) + 1
-                    values[name] = nuclide.findtext("x")
-            for name, count in counts.items():
-                if count == 1:
-                    result[name][i] = float(values[name])
+            columns = table["by name"].get(_sp)
+            if columns is None:
+                result[_sp] = np.zeros(len(rows))
+                continue
+            selection = np.ix_(rows, columns)
+            counts = np.sum(table["counts"][selection], axis=1)
+            values = np.sum(table["mass fractions"][selection], axis=1)
+            result[_sp] = np.where(counts == 1, values, 0.0)
 
         return result
 
@@ -621,66 +1340,45 @@ class Xml(wb.Base):
                         "elements."
                     )
 
+        table = self._get_zone_table()
+        rows = self._get_zone_rows(zone_xpath)
+
         my_dict = {}
 
         for prop in properties:
-            my_dict[prop] = []
-
-        zones = self._get_zones(zone_xpath)
-
-        for zone in zones:
-            by_name = {}
-            by_name_tag1 = {}
-            by_name_tag1_tag2 = {}
-
-            for node in zone.findall("optional_properties/property"):
-                name = node.get("name")
-                tag1 = node.get("tag1")
-                tag2 = node.get("tag2")
-                by_name.setdefault(name, node)
-                if tag1 is not None:
-                    by_name_tag1.setdefault((name, tag1), node)
-                    if tag2 is not None:
-                        by_name_tag1_tag2.setdefault((name, tag1, tag2), node)
-
-            for prop in properties:
-                tup = properties_t[prop]
-
-                if len(tup) == 1:
-                    data = by_name.get(tup[0])
-                elif len(tup) == 2:
-                    data = by_name_tag1.get(tup)
-                else:
-                    data = by_name_tag1_tag2.get(tup)
+            tup = properties_t[prop]
+
+            mask = table["property name"] == tup[0]
+            if len(tup) > 1:
+                mask &= table["property tags"] >= 1
+                mask &= table["property tag1"] == tup[1]
+            if len(tup) > 2:
+                mask &= table["property tags"] == 2
+                mask &= table["property tag2"] == tup[2]
+
+            matches = np.flatnonzero(mask)
+            first = np.full(len(table["labels"]), -1, dtype=np.intp)
+            _zones, index = np.unique(
+                table["property zone"][matches], return_index=True
+            )
+            first[_zones] = matches[index]
 
-                if data is None:
-                    raise KeyError(
-                        f"Property {self._get_property_name(tup)!r} not found."
-                    )
+            selected = first[rows]
+            if np.any(selected < 0):
+                raise KeyError(
+                    f"Property {self._get_property_name(tup)!r} not found."
+                )
 
-                my_dict[prop].append(data.text)
+            my_dict[prop] = [
+                None if empty else value
+                for value, empty in zip(
+                    table["property value"][selected].tolist(),
+                    table["property empty"][selected].tolist(),
+                )
+            ]
 
         return my_dict
 
-    def _get_all_zone_properties(self, zone):
-        result = {}
-
-        props = zone.findall("optional_properties/property")
-
-        for prop in props:
-            name = prop.get("name")
-            tag1 = prop.get("tag1")
-            tag2 = prop.get("tag2")
-            if tag1 is not None:
-                p_name = (name, tag1)
-                if tag2 is not None:
-                    p_name += (tag2,)
-            else:
-                p_name = name
-            result[p_name] = prop.text
-
-        return result
-
     def get_all_properties_for_zone(self, zone_xpath):
         """Method to retrieve all properties in a zone in an xml file
 
@@ -694,14 +1392,14 @@ class Xml(wb.Base):
 
         """
 
-        zones = self._get_zones(zone_xpath)
+        rows = self._get_zone_rows(zone_xpath)
 
-        if len(zones) != 1:
+        if len(rows) != 1:
             raise ValueError(
-                f"Zone XPath must select exactly one zone; found {len(zones)}."
+                f"Zone XPath must select exactly one zone; found {len(rows)}."
             )
 
-        return self._get_all_zone_properties(zones[0])
+        return self._get_zone_table_properties(rows[0])
 
     def get_properties_as_floats(self, properties, zone_xpath=" "):
         """Method to retrieve properties in zones in an xml file as floats.
@@ -726,13 +1424,48 @@ class Xml(wb.Base):
 
         return props
 
-    def get_all_abundances_in_zones(self, zone_xpath=" "):
+    def _get_abundance_scatter(self, rows, shape, nucleon=None):
+        table = self._get_zone_table()
+
+        columns = np.flatnonzero(np.any(table["counts"][rows], axis=0))
+        z = table["z"][columns]
+        n = table["a"][columns] - z
+
+        if np.any((z >= shape[0]) | (n < 0) | (n >= shape[1])):
+            raise IndexError("Zone species lie outside the network limits.")
+
+        if nucleon == "z":
+            cells, n_cells = z, shape[0]
+        elif nucleon == "n":
+            cells, n_cells = n, shape[1]
+        elif nucleon == "a":
+            cells, n_cells = z + n, shape[0] + shape[1] + 2
+        else:
+            cells, n_cells = z * shape[1] + n, shape[0] * shape[1]
+
+        return csr_matrix(
+            (1.0 / table["a"][columns], (columns, cells)),
+            shape=(len(table["species"]), n_cells),
+        )
+
+    def _get_abundance_shape(self):
+        lim = self.get_network_limits()
+        return (np.max(lim["z"]) + 1, np.max(lim["n_max"]) + 1)
+
+    def get_all_abundances_in_zones(self, zone_xpath=" ", sparse=False):
         """Method to retrieve all abundances in zones.
 
         Args:
             ``zone_xpath`` (:obj:`str`, optional): XPath expression to select
             zones.  Defaults to all zones.
 
+            ``sparse`` (:obj:`bool`, optional): If set to True, return the
+            abundances as a two-dimensional
+            :obj:`scipy.sparse.csr_matrix` in which the first index gives
+            the zone and the second index gives `z * (n_max + 1) + n`, where
+            `z` and `n` are the atomic and neutron numbers and `n_max` is the
+            largest neutron number in the network.  Defaults to False.
+
         Returns:
             :obj:`numpy.array`: A three-dimensional array in which the first
             index gives the zone, the second gives the atomic number,
@@ -744,23 +1477,23 @@ class Xml(wb.Base):
 
         """
 
-        zones = self._get_zones(zone_xpath)
-
-        lim = self.get_network_limits()
-        z_max = np.max(lim["z"])
-        n_max = np.max(lim["n_max"])
+        table = self._get_zone_table()
+        rows = self._get_zone_rows(zone_xpath)
+        shape = self._get_abundance_shape()
 
-        result = np.zeros((len(zones), z_max + 1, n_max + 1))
+        scatter = self._get_abundance_scatter(rows, shape)
+        mass_fractions = table["mass fractions"][rows]
 
-        for i, zone in enumerate(zones):
-            for nuclide in zone.findall("mass_fractions/nuclide"):
-                z = int(nuclide.findtext("z"))
-                a = int(nuclide.findtext("a"))
-                result[i, z, a - z] += float(nuclide.findtext("x")) / a
+        if sparse:
+            return csr_matrix(mass_fractions) @ scatter
 
-        return result
+        return np.asarray(mass_fractions @ scatter).reshape(
+            (len(rows),) + shape
+        )
 
-    def get_abundances_vs_nucleon_number(self, nucleon="a", zone_xpath=" "):
+    def get_abundances_vs_nucleon_number(
+        self, nucleon="a", zone_xpath=" ", batch_size=None
+    ):
         """Method to retrieve abundances summed over nucleon number in zones.
 
         Args:
@@ -770,6 +1503,10 @@ class Xml(wb.Base):
             ``zone_xpath`` (:obj:`str`, optional): XPath expression to select
             zones.  Defaults to all zones.
 
+            ``batch_size`` (:obj:`int`, optional): The number of zones to
+            process at a time, which bounds the temporary memory used.
+            Defaults to processing all zones at once.
+
         Returns:
             :obj:`numpy.array`: A two-dimensional array in which the first
             index gives the zone and the second gives the nucleon number
@@ -780,18 +1517,25 @@ class Xml(wb.Base):
         if nucleon not in ("z", "n", "a"):
             raise ValueError("nucleon must be 'z', 'n', or 'a'.")
 
-        _y = self.get_all_abundances_in_zones(zone_xpath)
+        if batch_size is not None and batch_size < 1:
+            raise ValueError("batch_size must be a positive integer.")
 
-        if nucleon == "z":
-            result = np.sum(_y, axis=2)
-        elif nucleon == "n":
-            result = np.sum(_y, axis=1)
-        else:
-            result = np.zeros((_y.shape[0], _y.shape[1] + _y.shape[2] + 2))
-            for i in range(_y.shape[0]):
-                for i_z in range(_y.shape[1]):
-                    for i_n in range(_y.shape[2]):
-                        result[i, i_z + i_n] += _y[i, i_z, i_n]
+        table = self._get_zone_table()
+        rows = self._get_zone_rows(zone_xpath)
+        scatter = self._get_abundance_scatter(
+            rows, self._get_abundance_shape(), nucleon
+        )
+
+        if batch_size is None:
+            batch_size = max(len(rows), 1)
+
+        result = np.zeros((len(rows), scatter.shape[1]))
+
+        for start in range(0, len(rows), batch_size):
+            batch = rows[start : start + batch_size]
+            result[start : start + len(batch)] = (
+                table["mass fractions"][batch] @ scatter
+            )
 
         return result
 
@@ -1520,61 +2264,52 @@ class Xml(wb.Base):
 
         """
 
-        zones = self._get_zones(zone_xpath)
+        table = self._get_zone_table()
 
         result = {}
 
-        for zone in zones:
-            label = "0"
-            label_1 = zone.xpath("@label1")
-            if label_1:
-                label = label_1[0]
-            label_2 = zone.xpath("@label2")
-            if label_2:
-                label = (label, label_2[0])
-            label_3 = zone.xpath("@label3")
-            if label_3:
-                label = (label[0], label[1], label_3[0])
-            result[label] = {
-                "properties": self._get_all_zone_properties(zone),
-                "mass fractions": self._get_nuclide_data_for_zone(zone),
+        for row in self._get_zone_rows(zone_xpath).tolist():
+            result[table["labels"][row]] = {
+                "properties": self._get_zone_table_properties(row),
+                "mass fractions": self._get_zone_table_mass_fractions(row),
             }
 
         return result
 
 
-class New_Xml(wb.Base):
-    """A class for creating webnucleo xml files.
+class Streaming_Xml(_Zone_Reader):
+    """A class for streaming zones from large webnucleo xml files.
 
-    Each instance corresponds to new xml.  Methods set
-    the nuclide, reaction, or zone data or write the xml to a file.
+    Unlike :class:`Xml`, an instance does not parse the whole file into
+    memory.  Zones are read one at a time and discarded once they have been
+    processed, so memory use does not grow with the number of zones in the
+    file.  XInclude directives are not processed.
 
     Args:
-        ``xml_type`` (:obj:`str`, optional): The type of xml file to
-        be created ("nuclear_data", "reaction_data", "nuclear_network",
-        "zone_data", or "libnucnet_input").  Defaults to "nuclear_network".
+        ``file`` (:obj:`str`): The name of the xml file.
 
     """
 
-    def __init__(self, xml_type="nuclear_network"):
-        if xml_type not in (
-            "nuclear_data",
-            "reaction_data",
-            "nuclear_network",
-            "zone_data",
-            "libnucnet_input",
-        ):
-            raise ValueError(f"Invalid XML type: {xml_type!r}.")
-        self._root = etree.Element(xml_type)
-        self._xml = etree.ElementTree(self._root)
-        if xml_type == "nuclear_network":
-            etree.SubElement(self._root, "nuclear_data")
-            etree.SubElement(self._root, "reaction_data")
-        elif xml_type == "libnucnet_input":
-            nuclear_network = etree.SubElement(self._root, "nuclear_network")
-            etree.SubElement(nuclear_network, "nuclear_data")
-            etree.SubElement(nuclear_network, "reaction_data")
-            etree.SubElement(self._root, "zone_data")
+    def __init__(self, file):
+        self._file = file
+
+    def iter_zones(self):
+        """Method to iterate over the zones in the webnucleo XML.
+
+        Returns:
+            An iterator over the zones in document order.  Each item is a
+            :obj:`tuple` whose first element is the zone label and whose
+            second element is a :obj:`dict` containing the zone data in the
+            same format as a value returned by :meth:`Xml.get_zone_data`.
+
+        """
+
+        for zone in _iter_zone_elements(self._file):
+            yield self._get_zone_label(zone), self._get_zone_data(zone)
+
+
+class _Xml_Writer(wb.Base):
+    """A base class for building webnucleo xml elements."""
 
     def _set_xml_data_for_nuclide(self, nuclide_element, nuclide):
         if nuclide_element.find("z") is None:
@@ -1619,45 +2354,6 @@ class New_Xml(wb.Base):
             log10_partf = np.log10(partf[i] / (2.0 * nuclide["spin"] + 1))
             etree.SubElement(point, "log10_partf").text = str(log10_partf)
 
-    def set_nuclide_data(self, nuclides):
-        """Method to set the nuclide data.
-
-        Args:
-
-            ``nuclides`` (:obj:`dict`): A dictionary containing the nuclides
-            to be created and their data.
-
-        Returns:
-            On successful return, the underlying xml has been created with
-            the data in ``nuclides``.
-
-        """
-
-        nuclear_data = self._xml.xpath("//nuclear_data")
-
-        if len(nuclear_data) == 0:
-            raise ValueError("This XML type does not contain nuclear_data.")
-
-        for nuc in nuclides:
-            my_nuc = nuclides[nuc]
-            my_xpath = self._xml.xpath(
-                "//nuclear_data/nuclide[ z = "
-                + str(my_nuc["z"])
-                + " and a = "
-                + str(my_nuc["a"])
-                + "]"
-            )
-            if len(my_xpath) == 0:
-                nuclear_data[0].append(
-                    etree.Comment(
-                        self.create_nuclide_name(my_nuc["z"], my_nuc["a"], "")
-                    )
-                )
-                nuclide = etree.SubElement(nuclear_data[0], "nuclide")
-            else:
-                nuclide = my_xpath[0]
-            self._set_xml_data_for_nuclide(nuclide, nuclides[nuc])
-
     def _set_xml_data_for_reaction(self, reaction_element, reaction):
         etree.SubElement(reaction_element, "source").text = str(
             reaction.source
@@ -1720,6 +2416,174 @@ class New_Xml(wb.Base):
                 f"Unsupported reaction type: {reaction.data['type']!r}."
             )
 
+    def _set_zone_labels(self, zone_element, label):
+        if isinstance(label, tuple):
+            for i, zone_label in enumerate(label):
+                zone_element.set("label" + str(i + 1), zone_label)
+        else:
+            zone_element.set("label1", label)
+
+    def _add_zone_property(self, props, my_property, value):
+        if isinstance(my_property, tuple) and not 1 <= len(my_property) <= 3:
+            raise ValueError(
+                "Zone property names must contain between one and "
+                "three elements."
+            )
+        prop = etree.SubElement(props, "property")
+        prop.text = str(value)
+        if isinstance(my_property, tuple):
+            prop.set("name", my_property[0])
+            if len(my_property) > 1:
+                prop.set("tag1", my_property[1])
+                if len(my_property) > 2:
+                    prop.set("tag2", my_property[2])
+        else:
+            prop.set("name", my_property)
+
+    def _set_xml_data_for_zone(self, zone_element, zone):
+        if len(zone["properties"]) > 0:
+            props = etree.SubElement(zone_element, "optional_properties")
+            for my_property in zone["properties"]:
+                self._add_zone_property(
+                    props, my_property, zone["properties"][my_property]
+                )
+
+        mass_fracs = etree.SubElement(zone_element, "mass_fractions")
+        for nuc in zone["mass fractions"]:
+            if zone["mass fractions"][nuc] != 0:
+                nuclide = etree.SubElement(mass_fracs, "nuclide")
+                nuclide.set("name", nuc[0])
+                etree.SubElement(nuclide, "z").text = str(nuc[1])
+                etree.SubElement(nuclide, "a").text = str(nuc[2])
+                etree.SubElement(nuclide, "x").text = str(
+                    zone["mass fractions"][nuc]
+                )
+
+    def _get_zone_array_species(self, species):
+        result = []
+        for sp in species:
+            if isinstance(sp, tuple):
+                name, _z, _a = sp
+            else:
+                name = sp
+                _z, _a, _state = self.get_z_a_state_from_nuclide_name(sp)
+            result.append((name, str(_z), str(_a)))
+        return result
+
+    def _iter_zone_elements_from_arrays(
+        self, labels, species, mass_fractions, properties
+    ):
+        mass_fractions = np.asarray(mass_fractions, dtype=np.float64)
+        if mass_fractions.shape != (len(labels), len(species)):
+            raise ValueError(
+                "The mass fractions must have one row for each zone label "
+                "and one column for each species."
+            )
+
+        properties = properties or {}
+        for my_property, values in properties.items():
+            if len(values) != len(labels):
+                raise ValueError(
+                    f"Property {my_property!r} must have one value for each "
+                    "zone."
+                )
+        property_values = [
+            (my_property, np.asarray(values).tolist())
+            for my_property, values in properties.items()
+        ]
+
+        species = self._get_zone_array_species(species)
+
+        for i, label in enumerate(labels):
+            zone_element = etree.Element("zone")
+            self._set_zone_labels(zone_element, label)
+
+            if property_values:
+                props = etree.SubElement(zone_element, "optional_properties")
+                for my_property, values in property_values:
+                    self._add_zone_property(props, my_property, values[i])
+
+            mass_fracs = etree.SubElement(zone_element, "mass_fractions")
+            row = mass_fractions[i]
+            columns = np.flatnonzero(row)
+            for column, x in zip(columns.tolist(), row[columns].tolist()):
+                name, _z, _a = species[column]
+                nuclide = etree.SubElement(mass_fracs, "nuclide")
+                nuclide.set("name", name)
+                etree.SubElement(nuclide, "z").text = _z
+                etree.SubElement(nuclide, "a").text = _a
+                etree.SubElement(nuclide, "x").text = str(x)
+
+            yield zone_element
+
+
+class New_Xml(_Xml_Writer):
+    """A class for creating webnucleo xml files.
+
+    Each instance corresponds to new xml.  Methods set
+    the nuclide, reaction, or zone data or write the xml to a file.
+
+    Args:
+        ``xml_type`` (:obj:`str`, optional): The type of xml file to
+        be created ("nuclear_data", "reaction_data", "nuclear_network",
+        "zone_data", or "libnucnet_input").  Defaults to "nuclear_network".
+
+    """
+
+    def __init__(self, xml_type="nuclear_network"):
+        if xml_type not in (
+            "nuclear_data",
+            "reaction_data",
+            "nuclear_network",
+            "zone_data",
+            "libnucnet_input",
+        ):
+            raise ValueError(f"Invalid XML type: {xml_type!r}.")
+        self._root = etree.Element(xml_type)
+        self._xml = etree.ElementTree(self._root)
+        self._nuclide_elements = {}
+        if xml_type == "nuclear_network":
+            etree.SubElement(self._root, "nuclear_data")
+            etree.SubElement(self._root, "reaction_data")
+        elif xml_type == "libnucnet_input":
+            nuclear_network = etree.SubElement(self._root, "nuclear_network")
+            etree.SubElement(nuclear_network, "nuclear_data")
+            etree.SubElement(nuclear_network, "reaction_data")
+            etree.SubElement(self._root, "zone_data")
+
+    def set_nuclide_data(self, nuclides):
+        """Method to set the nuclide data.
+
+        Args:
+
+            ``nuclides`` (:obj:`dict`): A dictionary containing the nuclides
+            to be created and their data.
+
+        Returns:
+            On successful return, the underlying xml has been created with
+            the data in ``nuclides``.
+
+        """
+
+        nuclear_data = self._xml.xpath("//nuclear_data")
+
+        if len(nuclear_data) == 0:
+            raise ValueError("This XML type does not contain nuclear_data.")
+
+        for nuc in nuclides:
+            my_nuc = nuclides[nuc]
+            key = (int(my_nuc["z"]), int(my_nuc["a"]))
+            nuclide = self._nuclide_elements.get(key)
+            if nuclide is None:
+                nuclear_data[0].append(
+                    etree.Comment(
+                        self.create_nuclide_name(my_nuc["z"], my_nuc["a"], "")
+                    )
+                )
+                nuclide = etree.SubElement(nuclear_data[0], "nuclide")
+                self._nuclide_elements[key] = nuclide
+            self._set_xml_data_for_nuclide(nuclide, nuclides[nuc])
+
     def set_reaction_data(self, reactions):
         """Method to set the reaction data.
 
@@ -1746,40 +2610,6 @@ class New_Xml(wb.Base):
             new_reaction = etree.SubElement(reaction_data[0], "reaction")
             self._set_xml_data_for_reaction(new_reaction, reactions[reaction])
 
-    def _set_xml_data_for_zone(self, zone_element, zone):
-        if len(zone["properties"]) > 0:
-            props = etree.SubElement(zone_element, "optional_properties")
-            for my_property in zone["properties"]:
-                if (
-                    isinstance(my_property, tuple)
-                    and not 1 <= len(my_property) <= 3
-                ):
-                    raise ValueError(
-                        "Zone property names must contain between one and "
-                        "three elements."
-                    )
-                prop = etree.SubElement(props, "property")
-                prop.text = str(zone["properties"][my_property])
-                if isinstance(my_property, tuple):
-                    prop.set("name", my_property[0])
-                    if len(my_property) > 1:
-                        prop.set("tag1", my_property[1])
-                        if len(my_property) > 2:
-                            prop.set("tag2", my_property[2])
-                else:
-                    prop.set("name", my_property)
-
-        mass_fracs = etree.SubElement(zone_element, "mass_fractions")
-        for nuc in zone["mass fractions"]:
-            if zone["mass fractions"][nuc] != 0:
-                nuclide = etree.SubElement(mass_fracs, "nuclide")
-                nuclide.set("name", nuc[0])
-                etree.SubElement(nuclide, "z").text = str(nuc[1])
-                etree.SubElement(nuclide, "a").text = str(nuc[2])
-                etree.SubElement(nuclide, "x").text = str(
-                    zone["mass fractions"][nuc]
-                )
-
     def set_zone_data(self, zones):
         """Method to set the zone data.
 
@@ -1801,14 +2631,49 @@ class New_Xml(wb.Base):
 
         for zone in zones:
             new_zone = etree.SubElement(zone_data[0], "zone")
-            if isinstance(zone, tuple):
-                for i, zone_label in enumerate(zone):
-                    label_str = "label" + str(i + 1)
-                    new_zone.set(label_str, zone_label)
-            else:
-                new_zone.set("label1", zone)
+            self._set_zone_labels(new_zone, zone)
             self._set_xml_data_for_zone(new_zone, zones[zone])
 
+    def set_zone_data_from_arrays(
+        self, labels, species, mass_fractions, properties=None
+    ):
+        """Method to set the zone data from arrays.
+
+        Args:
+
+            ``labels`` (:obj:`list`): A list of the zone labels, each a
+            string or a tuple of up to three strings.
+
+            ``species`` (:obj:`list`): A list of the species, each a
+            nuclide name or a tuple giving the name, atomic number, and mass
+            number.
+
+            ``mass_fractions`` (:obj:`numpy.array`): A two-dimensional array
+            in which the first index gives the zone, in the order of
+            ``labels``, and the second the species, in the order of
+            ``species``.  Zero mass fractions are not written.
+
+            ``properties`` (:obj:`dict`, optional): A dictionary of arrays
+            keyed by property name, each giving the property value in each
+            zone.  Defaults to no properties.
+
+        Returns:
+            On successful return, the underlying xml has been created with
+            the zone data.
+
+        """
+
+        zone_data = self._xml.xpath("//zone_data")
+
+        if len(zone_data) == 0:
+            raise ValueError("This XML type does not contain zone_data.")
+
+        zone_data[0].extend(
+            self._iter_zone_elements_from_arrays(
+                labels, species, mass_fractions, properties
+            )
+        )
+
     def write(self, file, pretty_print=True):
         """Method to write the xml to a file.
 
@@ -1827,3 +2692,251 @@ class New_Xml(wb.Base):
         """
 
         self._xml.write(file, pretty_print=pretty_print)
+
+
+_SECTION_ORDER = ("nuclear_data", "reaction_data", "zone_data")
+_SECTION_PATHS = {
+    "nuclear_data": {"nuclear_data": ()},
+    "reaction_data": {"reaction_data": ()},
+    "nuclear_network": {
+        "nuclear_data": ("nuclear_data",),
+        "reaction_data": ("reaction_data",),
+    },
+    "zone_data": {"zone_data": ()},
+    "libnucnet_input": {
+        "nuclear_data": ("nuclear_network", "nuclear_data"),
+        "reaction_data": ("nuclear_network", "reaction_data"),
+        "zone_data": ("zone_data",),
+    },
+}
+
+
+class Streaming_New_Xml(_Xml_Writer):
+    """A class for writing webnucleo xml files incrementally.
+
+    Unlike :class:`New_Xml`, an instance does not build the document in
+    memory.  It must be used as a context manager, and each nuclide,
+    reaction, or zone is serialized to the file as soon as it is set, so
+    memory use does not grow with the size of the output.  Because the
+    output is written in document order, nuclide data must be set before
+    reaction data, and reaction data before zone data.  Sections not set
+    are written empty when the context exits.
+
+    Args:
+        ``file`` (:obj:`str`): The name of the output xml file.
+
+        ``xml_type`` (:obj:`str`, optional): The type of xml file to
+        be created ("nuclear_data", "reaction_data", "nuclear_network",
+        "zone_data", or "libnucnet_input").  Defaults to "nuclear_network".
+
+        ``pretty_print`` (:obj:`bool`, optional): If set to True, each
+        nuclide, reaction, and zone is written in indented format on its own
+        lines.  Defaults to True.
+
+    """
+
+    def __init__(self, file, xml_type="nuclear_network", pretty_print=True):
+        if xml_type not in _SECTION_PATHS:
+            raise ValueError(f"Invalid XML type: {xml_type!r}.")
+        self._file = file
+        self._xml_type = xml_type
+        self._pretty_print = pretty_print
+        self._context = None
+        self._writer = None
+        self._open = []
+        self._section = -1
+
+    # The file and its open elements span several method calls, so their
+    # contexts are entered and exited by hand rather than in with blocks.
+
+    def __enter__(self):
+        self._context = etree.xmlfile(self._file)
+        self._writer = self._context.__enter__()
+        self._open_element(self._xml_type)
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        if exc_type is None:
+            for section in _SECTION_ORDER[self._section + 1 :]:
+                if section in _SECTION_PATHS[self._xml_type]:
+                    self._open_section(section)
+            self._close_elements(0)
+        context, self._context, self._writer = self._context, None, None
+        return context.__exit__(exc_type, exc_value, traceback)
+
+    def _write_indent(self):
+        if self._pretty_print:
+            self._writer.write("  " * len(self._open))
+
+    def _write_newline(self):
+        if self._pretty_print:
+            self._writer.write("\n")
+
+    def _open_element(self, tag):
+        self._write_indent()
+        element = self._writer.element(tag)
+        element.__enter__()  # pylint: disable=unnecessary-dunder-call
+        self._open.append((tag, element))
+        self._write_newline()
+
+    def _close_elements(self, depth):
+        while len(self._open) > depth:
+            element = self._open.pop()[1]
+            self._write_indent()
+            element.__exit__(None, None, None)
+            if self._open:
+                self._write_newline()
+
+    def _open_section(self, section):
+        if self._writer is None:
+            raise ValueError("The xml must be written within a with block.")
+
+        paths = _SECTION_PATHS[self._xml_type]
+        if section not in paths:
+            raise ValueError(f"This XML type does not contain {section}.")
+
+        order = _SECTION_ORDER.index(section)
+        if order < self._section:
+            raise ValueError(
+                "Nuclide, reaction, and zone data must be written in that "
+                "order."
+            )
+
+        # Skipped sections are written empty, as in New_Xml.
+        for skipped in _SECTION_ORDER[self._section + 1 : order]:
+            if skipped in paths:
+                self._open_path(paths[skipped])
+        self._section = order
+
+        self._open_path(paths[section])
+
+    def _open_path(self, section_path):
+        path = (self._xml_type,) + section_path
+        depth = 0
+        while (
+            depth < min(len(self._open), len(path))
+            and self._open[depth][0] == path[depth]
+        ):
+            depth += 1
+        self._close_elements(depth)
+
+        for tag in path[depth:]:
+            self._open_element(tag)
+
+    def _write_element(self, element):
+        if self._pretty_print and isinstance(element.tag, str):
+            etree.indent(element, level=len(self._open))
+        self._write_indent()
+        self._writer.write(element)
+        self._write_newline()
+
+    def set_nuclide_data(self, nuclides):
+        """Method to write nuclide data.
+
+        Args:
+
+            ``nuclides`` (:obj:`dict`): A dictionary containing the nuclides
+            to be written and their data.  All states of a nuclide must be
+            in the same call.
+
+        Returns:
+            On successful return, the nuclides have been written.
+
+        """
+
+        self._open_section("nuclear_data")
+
+        elements = {}
+        for nuclide in nuclides.values():
+            key = (nuclide["z"], nuclide["a"])
+            if key not in elements:
+                elements[key] = etree.Element("nuclide")
+            self._set_xml_data_for_nuclide(elements[key], nuclide)
+
+        for (z, a), element in elements.items():
+            self._write_element(
+                etree.Comment(self.create_nuclide_name(z, a, ""))
+            )
+            self._write_element(element)
+
+    def set_reaction_data(self, reactions):
+        """Method to write reaction data.
+
+        Args:
+
+            ``reactions`` (:obj:`dict`): A dictionary containing the reactions
+            to be written and their data.
+
+        Returns:
+            On successful return, the reactions have been written.
+
+        """
+
+        self._open_section("reaction_data")
+
+        for reaction in reactions.values():
+            self._write_element(etree.Comment(reaction.get_string()))
+            element = etree.Element("reaction")
+            self._set_xml_data_for_reaction(element, reaction)
+            self._write_element(element)
+
+    def set_zone_data(self, zones):
+        """Method to write zone data.
+
+        Args:
+
+            ``zones`` (:obj:`dict` or iterable): A dictionary containing the
+            zones to be written and their data, or an iterable of
+            (label, data) pairs, such as that returned by
+            :meth:`Streaming_Xml.iter_zones`.
+
+        Returns:
+            On successful return, the zones have been written.
+
+        """
+
+        self._open_section("zone_data")
+
+        if isinstance(zones, dict):
+            zones = zones.items()
+
+        for label, zone in zones:
+            element = etree.Element("zone")
+            self._set_zone_labels(element, label)
+            self._set_xml_data_for_zone(element, zone)
+            self._write_element(element)
+
+    def set_zone_data_from_arrays(
+        self, labels, species, mass_fractions, properties=None
+    ):
+        """Method to write zone data from arrays.
+
+        Args:
+
+            ``labels`` (:obj:`list`): A list of the zone labels, each a
+            string or a tuple of up to three strings.
+
+            ``species`` (:obj:`list`): A list of the species, each a
+            nuclide name or a tuple giving the name, atomic number, and mass
+            number.
+
+            ``mass_fractions`` (:obj:`numpy.array`): A two-dimensional array
+            in which the first index gives the zone, in the order of
+            ``labels``, and the second the species, in the order of
+            ``species``.  Zero mass fractions are not written.
+
+            ``properties`` (:obj:`dict`, optional): A dictionary of arrays
+            keyed by property name, each giving the property value in each
+            zone.  Defaults to no properties.
+
+        Returns:
+            On successful return, the zones have been written.
+
+        """
+
+        self._open_section("zone_data")
+
+        for element in self._iter_zone_elements_from_arrays(
+            labels, species, mass_fractions, properties
+        ):
+            self._write_element(element)